@@ -22,6 +22,10 @@ AVAILABLE_LOCATIONS = ["USA", "China", "India", "Russia", "UK", "Germany"]
 def _normalize(word: str) -> str:
     return STEMMER.stem(word.lower())
 
+def tokenize(text: str) -> List[str]:
+    """Stem every non-stopword token, keeping duplicates (for term frequencies)."""
+    return [_normalize(t) for t in WORD_RE.findall(text.lower()) if t not in STOP_WORDS]
+
 def extract_keywords(text: str) -> List[str]:
     tokens = [t for t in WORD_RE.findall(text.lower()) if t not in STOP_WORDS]
     keywords = []
@@ -148,21 +152,34 @@ def analyze_activity(
     }
 
 
-def increment_interest_profile(profile: Dict[str, Counter], article: dict) -> Dict[str, Counter]:
+def profile_delta(article: dict) -> Dict[str, Counter]:
+    """Return only the interest profile increments contributed by ``article``."""
+    delta = {
+        "categories": Counter(),
+        "sources": Counter(),
+        "keywords": Counter(),
+        "locations": Counter(),
+    }
     category = article.get("category")
     source = article.get("source")
     text = f"{article.get('title', '')} {article.get('description', '')}"
     weight = article.get("interaction", 1)
 
     if category:
-        profile["categories"][category] += weight
+        delta["categories"][category] += weight
     if source:
-        profile["sources"][source] += weight
+        delta["sources"][source] += weight
     for word in set(extract_keywords(text)):
-        profile["keywords"][word] += weight
+        delta["keywords"][word] += weight
         if word.title() in AVAILABLE_LOCATIONS:
-            profile["locations"][word.title()] += weight
+            delta["locations"][word.title()] += weight
 
+    return delta
+
+
+def increment_interest_profile(profile: Dict[str, Counter], article: dict) -> Dict[str, Counter]:
+    for field, counts in profile_delta(article).items():
+        profile[field].update(counts)
     return profile
 
 def rank_categories_by_tfidf(user_keywords: List[str], category_docs: Dict[str, str]) -> List[str]:
@@ -0,0 +1,109 @@
+# backend/caching.py
+"""Small in-process caches shared by the API layer."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional
+
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU mapping whose entries expire after ``ttl`` seconds.
+
+    A value that takes a while to build can be stored with the
+    ``generation()`` read before building it; ``set`` then drops it if the
+    key was invalidated in the meantime, so the stale result can't outlive
+    the invalidation.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        # generation of each key's latest invalidation, oldest first; keys
+        # pushed out of it count as invalidated at the floor
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._invalidated_floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, generation: Optional[int] = None) -> bool:
+        """Store ``value``; returns False if ``key`` was invalidated after ``generation``."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and self._invalidated.get(key, self._invalidated_floor) > generation:
+                return False
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return True
+
+    def expires_in(self, key: Hashable) -> Optional[float]:
+        """Seconds until ``key`` expires, or ``None`` if it is missing or expired.
+
+        Does not count as a lookup or refresh the entry's LRU position.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None:
+            return None
+        remaining = entry[0] - time.monotonic()
+        return remaining if remaining > 0 else None
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+            self._generation += 1
+            self._invalidated[key] = self._generation
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > self.maxsize:
+                _, self._invalidated_floor = self._invalidated.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+            self._invalidated.clear()
+            self._invalidated_floor = self._generation
+
+    def keys(self) -> List[Hashable]:
+        """Return live keys, most recently used last."""
+        now = time.monotonic()
+        with self._lock:
+            return [key for key, (expires_at, _) in self._data.items() if expires_at > now]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,77 @@
+# backend/circuit_breaker.py
+"""Circuit breaker that stops calling an upstream after repeated failures."""
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker.
+
+    After ``failure_threshold`` failures in a row the circuit opens and
+    calls are refused for ``reset_timeout`` seconds. Then it lets a single
+    probe through (half-open): success closes the circuit, failure opens it
+    again. If a probe never reports back, another is let through after
+    ``reset_timeout``, so a lost probe cannot wedge the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CLOSED
+        self._failures = 0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() >= self._retry_at:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now."""
+        now = time.monotonic()
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if now < self._retry_at:
+                self.rejected += 1
+                return False
+            # let one probe through and hold the others back until it reports
+            self._state = HALF_OPEN
+            self._retry_at = now + self.reset_timeout
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            # calls already in flight when the circuit opened don't extend the cooldown
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self.opened += 1
+                self._state = OPEN
+                self._retry_at = time.monotonic() + self.reset_timeout
+
+    def stats(self) -> dict:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "retry_in_seconds": round(max(0.0, self._retry_at - time.monotonic()), 1) if state != CLOSED else 0.0,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
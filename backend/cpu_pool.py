@@ -0,0 +1,101 @@
+# backend/cpu_pool.py
+"""Bounded executor for CPU-heavy work called from async endpoints."""
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+
+class CPUPoolBusy(Exception):
+    """Raised when the pool's queue is full and the work should be shed."""
+
+
+class CPUExecutor:
+    """Runs blocking CPU work off the event loop with a bounded backlog.
+
+    Password hashing (hashlib releases the GIL) runs truly in parallel; pure
+    Python NLP still contends for the GIL, but no longer stalls the event
+    loop and, because the backlog is bounded, a login storm or NLP burst
+    queues here instead of inflating every other endpoint's latency.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 64):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cpu")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise CPUPoolBusy("CPU pool is saturated")
+            self._pending += 1
+            self.peak_pending = max(self.peak_pending, self._pending)
+        submitted = time.perf_counter()
+        # like asyncio.to_thread, run with the caller's context variables
+        context = contextvars.copy_context()
+        ran = False
+
+        def call():
+            nonlocal ran
+            started = time.perf_counter()
+            with self._lock:
+                ran = True
+                self._running += 1
+            try:
+                return context.run(fn, *args, **kwargs)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self.completed += 1
+                    wait = started - submitted
+                    self.total_wait += wait
+                    self.max_wait = max(self.max_wait, wait)
+                    self.total_run += finished - started
+
+        def release(_):
+            # a caller cancelled while the work was still queued: call() never ran
+            with self._lock:
+                if not ran:
+                    self._pending -= 1
+
+        try:
+            future = self._pool.submit(call)
+        except BaseException:
+            release(None)
+            raise
+        future.add_done_callback(release)
+        # cancelling the awaiting task cancels the work item if it is still queued
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self.completed or 1
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._pending - self._running,
+                "running": self._running,
+                "peak_pending": self.peak_pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_seconds": round(self.total_wait / done, 6),
+                "max_wait_seconds": round(self.max_wait, 6),
+                "avg_run_seconds": round(self.total_run / done, 6),
+            }
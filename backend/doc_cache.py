@@ -0,0 +1,77 @@
+# backend/doc_cache.py
+"""Read-through cache of per-user MongoDB documents."""
+import threading
+from typing import Optional
+
+from pymongo.errors import PyMongoError
+
+from caching import TTLCache
+
+
+class DocumentCache:
+    """Caches one document per ``user_id`` from ``collection``.
+
+    Callers invalidate entries after every write they make (write-through).
+    The short TTL bounds staleness for writes made by other workers, and
+    ``start_watcher`` can tighten that further on replica sets by following
+    the collection's change stream.
+    """
+
+    def __init__(self, collection, projection: Optional[dict] = None, maxsize: int = 5000, ttl: float = 30.0):
+        self.collection = collection
+        self.projection = projection
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def get(self, user_id: str) -> Optional[dict]:
+        """Return a shallow copy of the user's document, or ``None`` if it doesn't exist."""
+        doc = self._cache.get(user_id)
+        if doc is None:
+            generation = self._cache.generation()
+            doc = self.collection.find_one({"user_id": user_id}, self.projection)
+            if doc is None:
+                return None
+            # skipped if a write invalidated the entry while this read was in flight
+            self._cache.set(user_id, doc, generation=generation)
+        return dict(doc)
+
+    def set(self, user_id: str, doc: dict):
+        self._cache.set(user_id, dict(doc))
+
+    def invalidate(self, user_id: str):
+        self._cache.invalidate(user_id)
+
+    def start_watcher(self):
+        """Invalidate entries changed by other processes via a change stream."""
+        if self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, name=f"{self.collection.name}-cache-watch", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop.set()
+
+    def _watch(self):
+        pipeline = [
+            {"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}},
+            {"$project": {"operationType": 1, "fullDocument.user_id": 1}},
+        ]
+        try:
+            with self.collection.watch(pipeline, full_document="updateLookup") as stream:
+                while not self._stop.is_set():
+                    change = stream.try_next()
+                    if change is None:
+                        self._stop.wait(0.5)
+                        continue
+                    user_id = (change.get("fullDocument") or {}).get("user_id")
+                    if user_id:
+                        self._cache.invalidate(user_id)
+                    else:
+                        # deletes carry no user_id, so drop everything
+                        self._cache.clear()
+        except PyMongoError as e:
+            print(f"Change stream for {self.collection.name} stopped, relying on TTL: {e}")
+
+    def stats(self) -> dict:
+        return self._cache.stats()
@@ -0,0 +1,124 @@
+# backend/global_stats.py
+"""Materialized global popularity counters for categories and sources.
+
+Totals live in a single ``_id: "all"`` document and per-hour buckets carry
+the same counters for windowed queries; a window also includes the whole
+bucket its start falls in, so it spans up to one extra hour. Both are maintained with ``$inc``
+alongside profile writes; ``rebuild`` recomputes the totals from user
+profiles with an aggregation pipeline to correct any drift.
+"""
+import heapq
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from mongo_utils import escape_key, unescape_key
+
+STAT_FIELDS = ("categories", "sources")
+BUCKET_SECONDS = 3600
+WINDOWS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+
+class GlobalStats:
+    """Incrementally maintained top-K category and source popularity."""
+
+    def __init__(self, collection, refresh_seconds: float = 60.0, max_ranked: int = 100):
+        self.collection = collection
+        self.refresh_seconds = refresh_seconds
+        self.max_ranked = max_ranked
+        # window name (None for all time) -> (computed_at, {field: ranked keys})
+        self._ranked: Dict[Optional[str], Tuple[float, Dict[str, List[str]]]] = {}
+        self._lock = threading.Lock()
+
+    def ensure_indexes(self):
+        # hourly buckets are only needed for the longest window
+        self.collection.create_index(
+            "bucket_start",
+            expireAfterSeconds=int(WINDOWS["day"].total_seconds()) + BUCKET_SECONDS,
+            partialFilterExpression={"kind": "bucket"},
+        )
+
+    def record(self, deltas: Iterable[Dict[str, Counter]]):
+        """Fold a batch of profile deltas into the global and current-hour counters."""
+        totals = {field: Counter() for field in STAT_FIELDS}
+        for delta in deltas:
+            for field in STAT_FIELDS:
+                totals[field].update(delta.get(field) or {})
+
+        inc_ops = {
+            f"{field}.{escape_key(key)}": value
+            for field in STAT_FIELDS
+            for key, value in totals[field].items()
+            if key and value
+        }
+        if not inc_ops:
+            return
+
+        bucket_start = _bucket_start(datetime.now(timezone.utc))
+        self.collection.bulk_write(
+            [
+                UpdateOne({"_id": "all"}, {"$inc": inc_ops, "$set": {"kind": "total"}}, upsert=True),
+                UpdateOne(
+                    {"_id": f"bucket:{bucket_start.isoformat()}"},
+                    {"$inc": inc_ops, "$set": {"kind": "bucket", "bucket_start": bucket_start}},
+                    upsert=True,
+                ),
+            ],
+            ordered=False,
+        )
+
+    def top(self, limit: int = 5, window: Optional[str] = None) -> Tuple[List[str], List[str]]:
+        """Return the top categories and sources, optionally for ``"hour"`` or ``"day"``."""
+        if window is not None and window not in WINDOWS:
+            raise ValueError(f"Unknown window '{window}'")
+        with self._lock:
+            cached = self._ranked.get(window)
+            if cached is None or time.monotonic() - cached[0] > self.refresh_seconds:
+                cached = (time.monotonic(), self._rank(window))
+                self._ranked[window] = cached
+        ranked = cached[1]
+        return ranked["categories"][:limit], ranked["sources"][:limit]
+
+    def _rank(self, window: Optional[str]) -> Dict[str, List[str]]:
+        if window is None:
+            docs = [self.collection.find_one({"_id": "all"}) or {}]
+        else:
+            # include the bucket ``since`` falls in, so the window never covers less than its length
+            since = _bucket_start(datetime.now(timezone.utc) - WINDOWS[window])
+            docs = self.collection.find({"kind": "bucket", "bucket_start": {"$gte": since}})
+
+        counts = {field: Counter() for field in STAT_FIELDS}
+        for doc in docs:
+            for field in STAT_FIELDS:
+                counts[field].update(doc.get(field) or {})
+        return {
+            field: [
+                unescape_key(key)
+                for key, _ in heapq.nlargest(self.max_ranked, counts[field].items(), key=lambda kv: kv[1])
+            ]
+            for field in STAT_FIELDS
+        }
+
+    def rebuild(self, users_collection):
+        """Recompute all-time totals from every user's interest profile."""
+        totals = {}
+        for field in STAT_FIELDS:
+            pipeline = [
+                {"$project": {"entries": {"$objectToArray": {"$ifNull": [f"$interest_profile.{field}", {}]}}}},
+                {"$unwind": "$entries"},
+                {"$group": {"_id": "$entries.k", "count": {"$sum": "$entries.v"}}},
+            ]
+            totals[field] = {
+                row["_id"]: row["count"] for row in users_collection.aggregate(pipeline, allowDiskUse=True)
+            }
+        self.collection.replace_one({"_id": "all"}, {"kind": "total", **totals}, upsert=True)
+        with self._lock:
+            self._ranked.pop(None, None)
+
+
+def _bucket_start(moment: datetime) -> datetime:
+    return datetime.fromtimestamp(int(moment.timestamp()) // BUCKET_SECONDS * BUCKET_SECONDS, timezone.utc)
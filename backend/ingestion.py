@@ -0,0 +1,247 @@
+# backend/ingestion.py
+"""Scheduled ingestion of NewsAPI headlines into the local article corpus."""
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+from ai_model import extract_keywords
+from newsapi_client import CircuitOpen, NewsAPIClient, QuotaExceeded
+from quota import BACKGROUND
+
+# fields that only matter to storage and search, never to API clients
+ARTICLE_PROJECTION = {"_id": 0, "dedupe_key": 0, "keywords": 0, "pinned": 0, "expire_at": 0, "retagged_at": 0}
+NEWS_CATEGORIES = ["business", "entertainment", "general", "health", "science", "sports", "technology"]
+
+
+def _str_field(article: dict, key: str, default: str) -> str:
+    value = article.get(key)
+    return value if isinstance(value, str) and value else default
+
+
+def normalize_article(raw: dict, category: str, country: Optional[str] = None) -> Optional[dict]:
+    """Turn a raw NewsAPI article into the shape stored in the ``news`` collection."""
+    if not isinstance(raw, dict):
+        return None
+    title = _str_field(raw, "title", "No Title")
+    if title == "[Removed]":
+        return None
+
+    source_info = raw.get("source", {})
+    source_name = "Unknown"
+    if isinstance(source_info, dict):
+        source_name = source_info.get("name") or "Unknown"
+    elif isinstance(source_info, str):
+        source_name = source_info
+
+    url = _str_field(raw, "url", "#")
+    description = _str_field(raw, "description", "No Description")
+    return {
+        "article_id": str(uuid.uuid4()),
+        "dedupe_key": url if url != "#" else title.strip().lower(),
+        "title": title,
+        "description": description,
+        "url": url,
+        "urlToImage": _str_field(raw, "urlToImage", ""),
+        "publishedAt": _str_field(raw, "publishedAt", ""),
+        "source": source_name,
+        "category": category,
+        "categories": [category],
+        "country": country,
+        "keywords": extract_keywords(f"{title} {description}"),
+        "explanation": f"Matched category '{category}'",
+        "created_at": datetime.now(),
+        "pinned": False,
+    }
+
+
+class NewsIngestor:
+    """Keeps the local ``news`` collection populated from NewsAPI."""
+
+    def __init__(
+        self,
+        news_collection,
+        client: NewsAPIClient,
+        countries: Iterable[str] = ("us",),
+        categories: Iterable[str] = NEWS_CATEGORIES,
+        page_size: int = 100,
+        expire_after: Optional[timedelta] = None,
+    ):
+        self.news_collection = news_collection
+        self.client = client
+        self.countries = list(countries)
+        self.categories = list(categories)
+        self.page_size = page_size
+        # sets ``expire_at`` on new articles for the retention TTL index
+        self.expire_after = expire_after
+        self.on_ingest: List[Callable[[List[dict]], None]] = []
+        self.last_run: Dict[str, dict] = {}
+        self.deferred = 0
+
+    def ensure_indexes(self):
+        self.news_collection.create_index("article_id", unique=True)
+        self.news_collection.create_index("dedupe_key", unique=True, sparse=True)
+        self.news_collection.create_index(
+            [("categories", ASCENDING), ("publishedAt", DESCENDING), ("article_id", DESCENDING)]
+        )
+        self.news_collection.create_index("keywords")
+        # articles stored before multi-category tagging are listed under their one category
+        for category in self.news_collection.distinct("category", {"categories": {"$exists": False}}):
+            self.news_collection.update_many(
+                {"category": category, "categories": {"$exists": False}}, {"$set": {"categories": [category]}}
+            )
+
+    def store(self, articles: List[dict]) -> List[dict]:
+        """Upsert normalized articles, returning the stored version of each.
+
+        Duplicates keep the ``article_id`` and ``category`` they were first
+        stored with; every category an article is seen under is added to its
+        ``categories``, which is what the local queries filter on, and
+        ``retagged_at`` records when that last changed. Newly inserted
+        articles are passed to every ``on_ingest`` callback.
+        """
+        if not articles:
+            return []
+        unique = {}
+        for article in articles:
+            if self.expire_after is not None and not article.get("pinned"):
+                article["expire_at"] = article["created_at"] + self.expire_after
+            seen = unique.setdefault(article["dedupe_key"], article)
+            if seen is not article:
+                seen["categories"] = list(dict.fromkeys(seen["categories"] + article["categories"]))
+        now = datetime.now()
+        inserts = [
+            UpdateOne({"dedupe_key": key}, {"$setOnInsert": article}, upsert=True)
+            for key, article in unique.items()
+        ]
+        # only articles missing one of the categories are written (and stamped)
+        retags = [
+            UpdateOne(
+                {"dedupe_key": key, "categories": {"$not": {"$all": article["categories"]}}},
+                {"$addToSet": {"categories": {"$each": article["categories"]}}, "$set": {"retagged_at": now}},
+            )
+            for key, article in unique.items()
+        ]
+        # upserted_ids index into inserts, which come first
+        result = self.news_collection.bulk_write(inserts + retags, ordered=False)
+        keys = list(unique)
+        new_articles = [unique[keys[i]] for i in result.upserted_ids]
+
+        stored = {
+            doc["dedupe_key"]: doc
+            for doc in self.news_collection.find(
+                {"dedupe_key": {"$in": keys}}, {"_id": 0, "keywords": 0, "pinned": 0, "expire_at": 0, "retagged_at": 0}
+            )
+        }
+        for callback in self.on_ingest:
+            try:
+                callback(new_articles)
+            except Exception as e:
+                print(f"Ingest callback failed: {e}")
+        results = []
+        for article in articles:
+            doc = dict(stored.get(article["dedupe_key"], article))
+            for field in ("dedupe_key", "keywords", "pinned", "expire_at"):
+                doc.pop(field, None)
+            results.append(doc)
+        return results
+
+    def ingest(self, category: str, country: str) -> int:
+        """Fetch one category/country sweep and store it; returns the article count."""
+        raw_articles = self.client.top_headlines(
+            category=category, country=country, page_size=self.page_size, priority=BACKGROUND
+        )
+        articles = [a for a in (normalize_article(raw, category, country) for raw in raw_articles) if a]
+        stored = self.store(articles)
+        self.last_run[f"{country}:{category}"] = {"at": datetime.now().isoformat(), "articles": len(stored)}
+        return len(stored)
+
+    def _run_job(self, category: str, country: str):
+        try:
+            self.ingest(category, country)
+        except (QuotaExceeded, CircuitOpen):
+            # leave the budget to interactive traffic, or wait out the outage; the next interval retries
+            self.deferred += 1
+        except Exception as e:
+            print(f"Ingestion failed for {country}/{category}: {e}")
+
+    def schedule(self, scheduler, interval_minutes: int, wrap: Optional[Callable] = None):
+        """Register one interval job per country/category, staggered across the interval.
+
+        ``wrap(job_id, func)`` may decorate each job, e.g. to run it only on
+        the scheduling leader.
+        """
+        pairs = [(country, category) for country in self.countries for category in self.categories]
+        if not pairs:
+            return
+        step = timedelta(minutes=interval_minutes) / len(pairs)
+        start = datetime.now() + timedelta(seconds=5)
+        for i, (country, category) in enumerate(pairs):
+            job_id = f"ingest:{country}:{category}"
+            scheduler.add_job(
+                wrap(job_id, self._run_job) if wrap else self._run_job,
+                "interval",
+                minutes=interval_minutes,
+                args=[category, country],
+                id=job_id,
+                next_run_time=start + step * i,
+                replace_existing=True,
+            )
+
+    def query_local(
+        self,
+        category: str,
+        keywords: Optional[List[str]] = None,
+        limit: int = 10,
+        max_age: Optional[timedelta] = None,
+    ) -> List[dict]:
+        """Return the freshest stored articles for ``category`` matching any keyword stem."""
+        query: dict = {"categories": category}
+        if keywords:
+            query["keywords"] = {"$in": keywords}
+        if max_age is not None:
+            query["created_at"] = {"$gte": datetime.now() - max_age}
+        cursor = (
+            self.news_collection.find(query, ARTICLE_PROJECTION)
+            .sort([("publishedAt", DESCENDING)])
+            .limit(limit)
+        )
+        return list(cursor)
+
+    def query_page(
+        self,
+        categories: List[str],
+        keywords: Optional[List[str]] = None,
+        limit: int = 20,
+        max_age: Optional[timedelta] = None,
+        after: Optional[dict] = None,
+    ) -> List[dict]:
+        """Return up to ``limit`` stored articles newest first, strictly after the ``after`` keyset.
+
+        ``after`` holds the ``publishedAt`` (``p``) and ``article_id`` (``id``)
+        of the last article on the previous page.
+        """
+        clauses: List[dict] = [{"categories": {"$in": categories}}]
+        if keywords:
+            clauses.append({"keywords": {"$in": keywords}})
+        if max_age is not None:
+            clauses.append({"created_at": {"$gte": datetime.now() - max_age}})
+        if after:
+            clauses.append({"$or": [
+                {"publishedAt": {"$lt": after["p"]}},
+                {"publishedAt": after["p"], "article_id": {"$lt": after["id"]}},
+            ]})
+        cursor = (
+            self.news_collection.find({"$and": clauses}, ARTICLE_PROJECTION)
+            .sort([("publishedAt", DESCENDING), ("article_id", DESCENDING)])
+            .limit(limit)
+        )
+        return list(cursor)
+
+    def stats(self) -> dict:
+        return {
+            "jobs": len(self.countries) * len(self.categories),
+            "deferred": self.deferred,
+            "last_run": self.last_run,
+        }
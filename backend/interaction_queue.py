@@ -0,0 +1,198 @@
+# backend/interaction_queue.py
+"""Write-behind buffering of user interaction events.
+
+Endpoints enqueue a small event and return; a periodic flush runs the NLP
+for the whole batch, coalesces the resulting profile deltas per user and
+hands them to ``apply_batch`` in one bulk write. Interaction log entries
+queued alongside are handed to ``append_log`` in one batch as well. Events
+may carry just an article id; ``load_articles`` then fetches the fields
+for the whole batch in one query.
+"""
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, Dict, List, Optional
+
+from ai_model import profile_delta
+
+EVENT_FIELDS = ("title", "description", "category", "source")
+
+
+class PartialFlush(Exception):
+    """Raised by ``apply_batch`` when only some user deltas were written.
+
+    ``failed`` holds the deltas to retry; ``writes`` counts the ones applied.
+    """
+
+    def __init__(self, failed: Dict[str, Dict[str, Counter]], writes: int):
+        super().__init__(f"{len(failed)} user deltas failed")
+        self.failed = failed
+        self.writes = writes
+
+
+def _empty_delta() -> Dict[str, Counter]:
+    return {
+        "categories": Counter(),
+        "sources": Counter(),
+        "keywords": Counter(),
+        "locations": Counter(),
+    }
+
+
+class InteractionQueue:
+    """Thread-safe queue of interaction events with batched aggregation."""
+
+    def __init__(self, apply_batch: Callable[[Dict[str, Dict[str, Counter]]], int], max_depth: int = 50000,
+                 append_log: Optional[Callable[[List[dict]], List[dict]]] = None,
+                 request_flush: Optional[Callable[[], None]] = None,
+                 load_articles: Optional[Callable[[List[str]], Dict[str, dict]]] = None):
+        self._apply_batch = apply_batch
+        # maps article ids to their stored fields; ids it omits no longer exist
+        self._load_articles = load_articles
+        # asks whoever runs flush() to run it now; called from request handlers, so it must not block
+        self._request_flush = request_flush or self._flush_in_background
+        self._flush_requested = threading.Event()
+        # returns the entries that failed and should be retried
+        self._append_log = append_log
+        self._events = deque()
+        self._log_events = deque()
+        self._flush_lock = threading.Lock()
+        self.max_depth = max_depth
+        self.enqueued = 0
+        self.flushed_events = 0
+        self.flushes = 0
+        self.writes = 0
+        self.failed_flushes = 0
+        self.logged = 0
+        self.last_flush_seconds = 0.0
+        self.last_flush_at = None
+
+    def enqueue(self, user_id: str, article: Optional[dict] = None, interaction: int = 1,
+                delta: Optional[Dict[str, Counter]] = None, log_event: Optional[dict] = None,
+                article_id: Optional[str] = None):
+        """Record an interaction; profile NLP and the log append are deferred to the next flush.
+
+        Without ``article``, the fields of ``article_id`` are loaded at flush time.
+        """
+        if not article and article_id and self._load_articles is None:
+            raise ValueError("article_id without article needs load_articles")
+        if log_event is not None:
+            self._log_events.append(log_event)
+        self.enqueued += 1
+        if article:
+            event_article = {field: article.get(field) for field in EVENT_FIELDS}
+            event_article["interaction"] = interaction
+            self._events.append((user_id, event_article, delta))
+        elif article_id:
+            self._events.append((user_id, {"article_id": article_id, "interaction": interaction}, delta))
+        elif delta:
+            self._events.append((user_id, None, delta))
+        if self.depth() >= self.max_depth and not self._flush_requested.is_set():
+            # drain early instead of growing until the next interval, once per flush
+            self._flush_requested.set()
+            self._request_flush()
+
+    def depth(self) -> int:
+        return len(self._events) + len(self._log_events)
+
+    def flush(self) -> int:
+        """Drain queued events, aggregate per user and apply them in bulk."""
+        with self._flush_lock:
+            self._flush_requested.clear()
+            started = time.perf_counter()
+            self._flush_log()
+            pending = len(self._events)
+            if not pending:
+                return 0
+
+            events = [self._events.popleft() for _ in range(pending)]
+            try:
+                events = self._resolve(events)
+            except Exception as e:
+                print(f"Interaction flush could not load articles, requeueing {pending} events: {e}")
+                self._events.extendleft(reversed(events))
+                self.failed_flushes += 1
+                return 0
+
+            per_user: Dict[str, Dict[str, Counter]] = {}
+            for user_id, article, delta in events:
+                user_delta = per_user.setdefault(user_id, _empty_delta())
+                if article:
+                    for field, counts in profile_delta(article).items():
+                        user_delta[field].update(counts)
+                for field, counts in (delta or {}).items():
+                    user_delta[field].update(counts)
+
+            try:
+                writes = self._apply_batch(per_user)
+            except PartialFlush as e:
+                # only the failed deltas go back; the rest are already applied
+                print(f"Interaction flush partly failed, requeueing {len(e.failed)} user deltas")
+                self._requeue(e.failed)
+                self.failed_flushes += 1
+                writes = e.writes
+            except Exception as e:
+                print(f"Interaction flush failed, requeueing {len(per_user)} user deltas: {e}")
+                self._requeue(per_user)
+                self.failed_flushes += 1
+                return 0
+
+            self.flushes += 1
+            self.flushed_events += pending
+            self.writes += writes or 0
+            self.last_flush_seconds = time.perf_counter() - started
+            self.last_flush_at = time.time()
+            return pending
+
+    def _resolve(self, events: List[tuple]) -> List[tuple]:
+        """Fill in the fields of events queued with only an article id."""
+        ids = {article["article_id"] for _, article, _ in events if article and "article_id" in article}
+        if not ids:
+            return events
+        found = self._load_articles(list(ids))
+        resolved = []
+        for user_id, article, delta in events:
+            if article and "article_id" in article:
+                doc = found.get(article["article_id"])
+                if doc is None:
+                    # the article is gone, so there is nothing to learn from it
+                    if not delta:
+                        continue
+                    article = None
+                else:
+                    article = dict({field: doc.get(field) for field in EVENT_FIELDS}, interaction=article["interaction"])
+            resolved.append((user_id, article, delta))
+        return resolved
+
+    def _requeue(self, deltas: Dict[str, Dict[str, Counter]]):
+        for user_id, user_delta in deltas.items():
+            self._events.appendleft((user_id, None, user_delta))
+
+    def _flush_in_background(self):
+        threading.Thread(target=self.flush, name="interaction-flush", daemon=True).start()
+
+    def _flush_log(self):
+        if self._append_log is None or not self._log_events:
+            return
+        batch = [self._log_events.popleft() for _ in range(len(self._log_events))]
+        try:
+            failed = self._append_log(batch)
+        except Exception as e:
+            print(f"Interaction log append failed, requeueing {len(batch)} entries: {e}")
+            failed = batch
+        self.logged += len(batch) - len(failed)
+        self._log_events.extendleft(reversed(failed))
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.depth(),
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "flushed_events": self.flushed_events,
+            "logged": self.logged,
+            "flushes": self.flushes,
+            "writes": self.writes,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_seconds": round(self.last_flush_seconds, 6),
+            "last_flush_at": self.last_flush_at,
+        }
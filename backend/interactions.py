@@ -0,0 +1,177 @@
+# backend/interactions.py
+"""Append-only interaction log plus the per-user saved/liked lists.
+
+Every save, like, unsave and read is appended to ``log`` with its
+timestamp (and dwell time for reads); endpoints buffer these entries in
+the interaction queue, which appends them in batches. Saved and liked membership lives in
+``lists``, one document per (user, list, article), so listings page by
+keyset on an index instead of loading an ever-growing array from the
+user document. The user document only keeps the most recent ids.
+"""
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
+
+ACTIONS = ("save", "unsave", "like", "read")
+LISTS = {"save": "saved", "like": "liked"}
+# legacy array field on the user document for each list
+LEGACY_FIELDS = {"saved": "saved_articles", "liked": "liked_articles"}
+RECENT_IDS = 50
+DUPLICATE_KEY = 11000
+
+
+class InteractionLog:
+    def __init__(self, log, lists, users, recent_ids: int = RECENT_IDS):
+        self.log = log
+        self.lists = lists
+        self.users = users
+        self.recent_ids = recent_ids
+
+    def ensure_indexes(self):
+        self.log.create_index([("user_id", ASCENDING), ("at", DESCENDING)])
+        self.log.create_index([("user_id", ASCENDING), ("action", ASCENDING), ("at", DESCENDING)])
+        self.log.create_index([("article_id", ASCENDING), ("at", DESCENDING)])
+        self.lists.create_index(
+            [("user_id", ASCENDING), ("list", ASCENDING), ("article_id", ASCENDING)], unique=True
+        )
+        self.lists.create_index(
+            [("user_id", ASCENDING), ("list", ASCENDING), ("at", DESCENDING), ("article_id", DESCENDING)]
+        )
+        self.lists.create_index("article_id")
+
+    def event(self, user_id: str, article_id: str, action: str, dwell_seconds: Optional[float] = None) -> dict:
+        """Build one log entry, stamped now."""
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action '{action}'")
+        event = {"user_id": user_id, "article_id": article_id, "action": action, "at": datetime.now()}
+        if dwell_seconds is not None:
+            event["dwell_seconds"] = dwell_seconds
+        return event
+
+    def append_many(self, events: List[dict]) -> List[dict]:
+        """Insert buffered log entries; returns the ones that failed and may be retried.
+
+        pymongo assigns each entry its ``_id`` before sending, so a retried
+        entry that did reach the server is rejected as a duplicate instead
+        of being logged twice.
+        """
+        if not events:
+            return []
+        try:
+            self.log.insert_many(events, ordered=False)
+        except BulkWriteError as e:
+            failed = {err["index"] for err in e.details.get("writeErrors", []) if err.get("code") != DUPLICATE_KEY}
+            return [events[i] for i in sorted(failed)]
+        return []
+
+    def apply(self, event: dict):
+        """Apply a save, like or unsave to the user's list."""
+        user_id, article_id, action = event["user_id"], event["article_id"], event["action"]
+        if action in LISTS:
+            self.lists.update_one(
+                {"user_id": user_id, "list": LISTS[action], "article_id": article_id},
+                {"$setOnInsert": {"at": event["at"]}},
+                upsert=True,
+            )
+        elif action == "unsave":
+            self.lists.delete_one({"user_id": user_id, "list": "saved", "article_id": article_id})
+
+    def sync_recent(self, events: List[dict]):
+        """Mirror applied list changes into the bounded recent-id arrays on user documents.
+
+        Runs in the batched flush rather than per request; re-running a
+        batch does not add an id twice.
+        """
+        ops = []
+        for event in events:
+            user_id, article_id, action = event["user_id"], event["article_id"], event["action"]
+            if action in LISTS:
+                field = LEGACY_FIELDS[LISTS[action]]
+                ops.append(UpdateOne(
+                    {"user_id": user_id, field: {"$ne": article_id}},
+                    {"$push": {field: {"$each": [article_id], "$slice": -self.recent_ids}}},
+                ))
+            elif action == "unsave":
+                ops.append(UpdateOne({"user_id": user_id}, {"$pull": {"saved_articles": article_id}}))
+        if ops:
+            # ordered, so a save followed by an unsave of the same article ends unsaved
+            self.users.bulk_write(ops)
+
+    def page(self, user_id: str, name: str, limit: int = 50, after: Optional[dict] = None) -> List[dict]:
+        """Return list entries newest first, strictly after the ``after`` keyset.
+
+        ``after`` holds the ``at`` timestamp (``t``, ISO format) and
+        ``article_id`` (``id``) of the last entry on the previous page.
+        """
+        query = {"user_id": user_id, "list": name}
+        if after:
+            at = datetime.fromisoformat(after["t"])
+            query["$or"] = [
+                {"at": {"$lt": at}},
+                {"at": at, "article_id": {"$lt": after["id"]}},
+            ]
+        cursor = (
+            self.lists.find(query, {"_id": 0, "article_id": 1, "at": 1})
+            .sort([("at", DESCENDING), ("article_id", DESCENDING)])
+            .limit(limit)
+        )
+        return list(cursor)
+
+    def contains(self, user_id: str, name: str, article_ids: Iterable[str]) -> set:
+        """Return which of ``article_ids`` are on the user's list."""
+        article_ids = list(article_ids)
+        if not article_ids:
+            return set()
+        docs = self.lists.find(
+            {"user_id": user_id, "list": name, "article_id": {"$in": article_ids}},
+            {"_id": 0, "article_id": 1},
+        )
+        return {doc["article_id"] for doc in docs}
+
+    def migration_pending(self) -> bool:
+        """Whether some user's saved/liked arrays have not been copied into ``lists`` yet."""
+        return self.users.find_one({"interactions_migrated": {"$ne": True}}, {"_id": 1}) is not None
+
+    def legacy_article_ids(self) -> set:
+        """Article ids still only referenced from unmigrated users' embedded arrays."""
+        query = {"interactions_migrated": {"$ne": True}}
+        ids = set()
+        for field in LEGACY_FIELDS.values():
+            ids.update(aid for aid in self.users.distinct(field, query) if isinstance(aid, str))
+        return ids
+
+    def migrate_legacy_arrays(self, batch_size: int = 500) -> int:
+        """Copy embedded saved/liked arrays into ``lists`` and trim them.
+
+        Legacy arrays have no timestamps, so entries get the user's
+        ``created_at`` offset by their array position to keep their order.
+        Safe to re-run; returns the number of users migrated.
+        """
+        migrated = 0
+        users = self.users.find(
+            {"interactions_migrated": {"$ne": True}},
+            {"_id": 0, "user_id": 1, "created_at": 1, "saved_articles": 1, "liked_articles": 1},
+        )
+        for user in users:
+            base = user.get("created_at") or datetime.now()
+            ops = []
+            trimmed = {}
+            for name, field in LEGACY_FIELDS.items():
+                ids = [aid for aid in user.get(field) or [] if isinstance(aid, str)]
+                for position, article_id in enumerate(ids):
+                    ops.append(UpdateOne(
+                        {"user_id": user["user_id"], "list": name, "article_id": article_id},
+                        {"$setOnInsert": {"at": base.replace(microsecond=0) + timedelta(milliseconds=position)}},
+                        upsert=True,
+                    ))
+                trimmed[field] = ids[-self.recent_ids:]
+            for start in range(0, len(ops), batch_size):
+                self.lists.bulk_write(ops[start:start + batch_size], ordered=False)
+            self.users.update_one(
+                {"user_id": user["user_id"]},
+                {"$set": dict(trimmed, interactions_migrated=True)},
+            )
+            migrated += 1
+        return migrated
@@ -0,0 +1,144 @@
+# backend/leader.py
+"""Mongo lease so that only one worker process runs the shared scheduled jobs."""
+import functools
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+
+from pymongo import DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+JOB_HISTORY_DAYS = 7
+
+
+class LeaderLease:
+    """A renewable lease document; its holder is the scheduling leader.
+
+    Every worker calls ``renew`` on an interval well below
+    ``lease_seconds``. The holder extends its lease; the others take over
+    only once it has expired, so a crashed leader is replaced within one
+    lease period. Jobs wrapped with ``leader_only`` are skipped on
+    followers and recorded in ``history`` on the leader.
+    """
+
+    def __init__(self, collection, history=None, name: str = "scheduler", lease_seconds: int = 30):
+        self.collection = collection
+        self.history = history
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        # monotonic deadline of our own lease, 0 while we are a follower
+        self._held_until = 0.0
+        self.acquired_at: Optional[datetime] = None
+        self.takeovers = 0
+
+    @property
+    def is_leader(self) -> bool:
+        return time.monotonic() < self._held_until
+
+    def ensure_indexes(self):
+        if self.history is not None:
+            self.history.create_index([("job", 1), ("started_at", DESCENDING)])
+            self.history.create_index("started_at", expireAfterSeconds=JOB_HISTORY_DAYS * 86400)
+
+    def renew(self) -> bool:
+        """Acquire or extend the lease; returns whether this process now leads."""
+        now = datetime.now(timezone.utc)
+        started = time.monotonic()
+        try:
+            doc = self.collection.find_one_and_update(
+                {"_id": self.name, "$or": [{"owner": self.owner}, {"expires_at": {"$lt": now}}]},
+                {"$set": {
+                    "owner": self.owner,
+                    "expires_at": now + timedelta(seconds=self.lease_seconds),
+                    "renewed_at": now,
+                }},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # the lease exists and is held by someone else
+            doc = None
+        except PyMongoError as e:
+            # can't prove we still hold it, so stop acting as leader
+            print(f"Leader lease renewal failed: {e}")
+            doc = None
+
+        with self._lock:
+            if doc is not None and doc.get("owner") == self.owner:
+                if not self.is_leader:
+                    self.acquired_at = now
+                    self.takeovers += 1
+                    print(f"Worker {self.owner} became scheduler leader")
+                # measured from before the round trip so we never outlive the stored lease
+                self._held_until = started + self.lease_seconds
+            else:
+                self._held_until = 0.0
+                self.acquired_at = None
+        return self.is_leader
+
+    def release(self):
+        with self._lock:
+            self._held_until = 0.0
+            self.acquired_at = None
+        try:
+            self.collection.delete_one({"_id": self.name, "owner": self.owner})
+        except PyMongoError as e:
+            print(f"Leader lease release failed: {e}")
+
+    def leader_only(self, job: str, func: Callable) -> Callable:
+        """Wrap a scheduled job so it runs only on the leader and is recorded."""
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            if not self.is_leader:
+                return None
+            started_at = datetime.now(timezone.utc)
+            started = time.perf_counter()
+            status, error = "ok", None
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                status, error = "error", str(e)
+                raise
+            finally:
+                self._record(job, started_at, time.perf_counter() - started, status, error)
+        return run
+
+    def _record(self, job: str, started_at: datetime, duration: float, status: str, error: Optional[str]):
+        if self.history is None:
+            return
+        try:
+            self.history.insert_one({
+                "job": job,
+                "owner": self.owner,
+                "started_at": started_at,
+                "duration_seconds": round(duration, 3),
+                "status": status,
+                "error": error,
+            })
+        except PyMongoError as e:
+            print(f"Could not record run of {job}: {e}")
+
+    def recent_runs(self, job: Optional[str] = None, limit: int = 50) -> List[dict]:
+        if self.history is None:
+            return []
+        query = {"job": job} if job else {}
+        return list(self.history.find(query, {"_id": 0}).sort("started_at", DESCENDING).limit(limit))
+
+    def stats(self) -> dict:
+        try:
+            holder = self.collection.find_one({"_id": self.name}, {"_id": 0})
+        except PyMongoError:
+            holder = None
+        return {
+            "owner": self.owner,
+            "is_leader": self.is_leader,
+            "acquired_at": self.acquired_at,
+            "takeovers": self.takeovers,
+            "lease": holder,
+        }
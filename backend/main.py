@@ -1,19 +1,27 @@
 # backend/main.py
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional
 from collections import Counter
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.background import BackgroundScheduler
-from bson import ObjectId
+import orjson
 from collections import Counter
 import re
-from pymongo import MongoClient
+import asyncio
+import hashlib
+import logging
+import random
+import threading
+import time
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
 import os
 import requests
 import uuid
-from urllib.parse import quote_plus
 from datetime import datetime, timedelta, timezone
 from werkzeug.security import generate_password_hash, check_password_hash
 import jwt
@@ -23,37 +31,204 @@ from ai_model import (
     recommend_articles,
     extract_keywords,
     AVAILABLE_LOCATIONS,
-    increment_interest_profile,
+    STOP_WORDS,
     rank_categories_by_tfidf
 )
+from interaction_queue import InteractionQueue, PartialFlush
+from caching import TTLCache
+from doc_cache import DocumentCache
+from mongo_utils import escape_key, unescape_key
+from global_stats import GlobalStats
+from newsapi_client import (
+    DEFAULT_BASE_URL,
+    DeadlineMiddleware,
+    NewsAPIClient,
+    NewsAPIError,
+    UpstreamUnavailable,
+    call_priority,
+)
+from circuit_breaker import CLOSED, CircuitBreaker
+from quota import BACKGROUND, SharedQuotaManager
+from ingestion import ARTICLE_PROJECTION, NEWS_CATEGORIES, NewsIngestor, normalize_article
+from search_index import INDEX_FIELDS, BM25Index
+from suggest import MAX_SUGGESTIONS, PrefixSuggester
+from pagination import decode_cursor, encode_cursor, page_after
+from cpu_pool import CPUExecutor, CPUPoolBusy
+from leader import LeaderLease
+from interactions import InteractionLog
+from retention import ArticleRetention
+from metrics import Metrics
+from profiling import ProfilingMiddleware, RequestProfiler
+from memory import GROUP_BY, MemoryTracker, process_memory
 
 # Load environment variables
 load_dotenv()
 
+class FastJSONResponse(ORJSONResponse):
+    """Single-pass orjson rendering; datetimes are native, anything else (e.g. ObjectId) becomes str.
+
+    Endpoints with large payloads return it directly, which also skips
+    FastAPI's ``jsonable_encoder`` walk over the content.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
 # Initialize FastAPI
-app = FastAPI(title="News Feed API", version="1.0.0")
+app = FastAPI(title="News Feed API", version="1.0.0", default_response_class=FastJSONResponse)
 
 # Scheduler for periodic news updates
 scheduler = BackgroundScheduler()
 
 
-def scheduled_news_fetch():
-    """Fetch trending news articles on a schedule."""
+def rebuild_global_stats():
+    """Recompute global popularity totals to correct incremental drift."""
+    try:
+        global_stats.rebuild(users_collection)
+    except Exception as e:
+        print(f"Global stats rebuild failed: {e}")
+
+
+_index_synced_at: Optional[datetime] = None
+
+
+def build_search_index():
+    """Index stored articles this process hasn't indexed yet.
+
+    The first run indexes the whole corpus. Only the scheduling leader
+    ingests, so later runs pick up what it stored or re-tagged under another
+    category since the previous run.
+    """
+    global _index_synced_at
+    started = datetime.now()
+    query = {}
+    if _index_synced_at is not None:
+        since = _index_synced_at - timedelta(minutes=1)
+        query = {"$or": [{"created_at": {"$gte": since}}, {"retagged_at": {"$gte": since}}]}
+    try:
+        for article in news_collection.find(query, INDEX_FIELDS):
+            if search_index.add(article):
+                suggester.add_text(article.get("title") or "")
+        if _index_synced_at is None:
+            suggester.rebuild()
+            print(f"Search index built with {len(search_index)} articles")
+        _index_synced_at = started
+    except Exception as e:
+        print(f"Search index build failed: {e}")
+
+
+def compact_articles():
+    """Archive articles past retention that no user has saved or liked."""
     try:
-        _fetch_trending_news()
+        if interaction_log.migration_pending():
+            # saves still in legacy arrays aren't visible to retention yet
+            print("Skipping article compaction until saved/liked arrays are migrated")
+            return
+        archived = retention.compact()
+        if archived:
+            print(f"Archived {archived} expired articles")
     except Exception as e:
-        print(f"Scheduled news fetch failed: {e}")
+        print(f"Article compaction failed: {e}")
+
+
+def prune_search_index():
+    """Drop articles archived or expired by another worker from this process's index."""
+    try:
+        stored = news_collection.find({}, {"_id": 0, "article_id": 1})
+        removed = search_index.prune(doc["article_id"] for doc in stored)
+        if removed:
+            print(f"Pruned {removed} articles from the search index")
+    except Exception as e:
+        print(f"Search index prune failed: {e}")
+
+
+def migrate_interactions():
+    """Move legacy embedded saved/liked arrays into the interaction lists.
+
+    Retried on an interval, so it still runs if another worker held the
+    lease at startup; the job removes itself once nothing is left.
+    """
+    try:
+        migrated = interaction_log.migrate_legacy_arrays()
+        if migrated:
+            print(f"Migrated saved/liked articles for {migrated} users")
+        if not interaction_log.migration_pending():
+            scheduler.remove_job("migrate_interactions")
+    except JobLookupError:
+        pass
+    except Exception as e:
+        print(f"Interaction migration failed: {e}")
+
+
+def prewarm_feed_cache():
+    """Rebuild cached feeds of recently active users that are missing, stale or about to expire."""
+    for user_id in recent_feed_users.keys()[-FEED_PREWARM_MAX_USERS:]:
+        try:
+            generation = feed_cache.generation()
+            cached, version = _cached_feed(user_id)
+            remaining = feed_cache.expires_in(user_id)
+            # still current past the next run; rebuilding now would only spend quota and CPU
+            if cached is not None and remaining is not None and remaining > 2 * FEED_PREWARM_INTERVAL_SECONDS:
+                continue
+            # nobody is waiting on these, so live fetches leave the reserve to interactive traffic
+            with call_priority(BACKGROUND):
+                feed = _build_personalized_feed(user_id)
+            feed_cache.set(user_id, dict(feed, version=version), generation=generation)
+        except Exception as e:
+            print(f"Feed pre-warm failed for {user_id}: {e}")
 
 
 @app.on_event("startup")
 def start_scheduler():
-    scheduler.add_job(scheduled_news_fetch, "interval", minutes=60)
+    try:
+        global_stats.ensure_indexes()
+        ingestor.ensure_indexes()
+        scheduler_lease.ensure_indexes()
+        interaction_log.ensure_indexes()
+        # pin what unmigrated users saved before retention stamps expiry dates
+        retention.pin_many(interaction_log.legacy_article_ids())
+        retention.ensure_indexes()
+    except Exception as e:
+        print(f"Could not create indexes: {e}")
+    # every worker competes for the lease; shared jobs run only on the holder
+    scheduler_lease.renew()
+    scheduler.add_job(scheduler_lease.renew, "interval", seconds=max(1, SCHEDULER_LEASE_SECONDS // 3))
+    scheduler.add_job(
+        scheduler_lease.leader_only("rebuild_global_stats", rebuild_global_stats), "interval", hours=24
+    )
+    ingestor.schedule(scheduler, INGEST_INTERVAL_MINUTES, wrap=scheduler_lease.leader_only)
+    scheduler.add_job(
+        scheduler_lease.leader_only("migrate_interactions", migrate_interactions),
+        "interval",
+        minutes=5,
+        id="migrate_interactions",
+        next_run_time=datetime.now(),
+    )
+    scheduler.add_job(scheduler_lease.leader_only("compact_articles", compact_articles), "interval", hours=24)
+    # per-process state: each worker keeps its own index, caches and queue
+    scheduler.add_job(build_search_index, "interval", seconds=SEARCH_INDEX_SYNC_SECONDS, next_run_time=datetime.now())
+    scheduler.add_job(suggester.rebuild, "interval", seconds=60)
+    scheduler.add_job(prune_search_index, "interval", hours=6)
+    if USER_CACHE_CHANGE_STREAM:
+        user_docs.start_watcher()
+        preference_docs.start_watcher()
+    scheduler.add_job(interaction_queue.flush, "interval", seconds=INTERACTION_FLUSH_SECONDS, id="flush_interactions")
+    scheduler.add_job(prewarm_feed_cache, "interval", seconds=FEED_PREWARM_INTERVAL_SECONDS)
     scheduler.start()
+    if memory_tracker.tracing:
+        memory_tracker.snapshot("startup")
 
 
 @app.on_event("shutdown")
 def shutdown_scheduler():
     scheduler.shutdown()
+    scheduler_lease.release()
+    user_docs.stop_watcher()
+    preference_docs.stop_watcher()
+    # persist whatever interactions are still buffered
+    interaction_queue.flush()
+    cpu_pool.shutdown()
 
 app.add_middleware(
     CORSMiddleware,
@@ -63,25 +238,140 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+metrics = Metrics()
+
+
+@app.middleware("http")
+async def record_timings(request: Request, call_next):
+    """Time every request, record it per route and report its stages in ``Server-Timing``."""
+    timings, token = metrics.start_request()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        total = metrics.finish_request(timings, token, request.method, route, status)
+    response.headers["Server-Timing"] = timings.server_timing(total)
+    return response
+
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_MODE = os.getenv("PROFILE_MODE", "sampler")
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles"))
+profiler = RequestProfiler(PROFILE_DIR, sample_rate=PROFILE_SAMPLE_RATE, mode=PROFILE_MODE)
+# plain ASGI rather than @app.middleware, so unprofiled requests pass straight through
+app.add_middleware(ProfilingMiddleware, profiler=profiler, admin_token=ADMIN_TOKEN)
+
+
+# every upstream call a request makes shares one NewsAPI time budget
+UPSTREAM_DEADLINE_SECONDS = float(os.getenv("UPSTREAM_DEADLINE_SECONDS", "3"))
+app.add_middleware(DeadlineMiddleware, seconds=UPSTREAM_DEADLINE_SECONDS)
+
+
+@app.exception_handler(CPUPoolBusy)
+async def cpu_pool_busy_handler(request: Request, exc: CPUPoolBusy):
+    return FastJSONResponse({"detail": "Server busy, retry shortly"}, status_code=503, headers={"Retry-After": "1"})
+
+
+mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
+client = MongoClient(mongo_uri)
+db = client.news_feed_db
+users_collection = db.users
+news_collection = db.news
+user_preferences_collection = db.user_preferences
+global_stats = GlobalStats(db.global_stats)
+SCHEDULER_LEASE_SECONDS = int(os.getenv("SCHEDULER_LEASE_SECONDS", "30"))
+scheduler_lease = LeaderLease(db.scheduler_leases, db.job_runs, lease_seconds=SCHEDULER_LEASE_SECONDS)
+interaction_log = InteractionLog(db.interactions, db.user_articles, users_collection)
+
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "5000"))
+USER_CACHE_CHANGE_STREAM = os.getenv("USER_CACHE_CHANGE_STREAM", "").lower() in ("1", "true", "yes")
+user_docs = DocumentCache(
+    users_collection, {"_id": 0, "password": 0}, maxsize=USER_CACHE_MAX_ENTRIES, ttl=USER_CACHE_TTL_SECONDS
+)
+preference_docs = DocumentCache(
+    user_preferences_collection, {"_id": 0}, maxsize=USER_CACHE_MAX_ENTRIES, ttl=USER_CACHE_TTL_SECONDS
+)
 try:
-    mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
-    client = MongoClient(mongo_uri)
     client.admin.command('ping')
-    db = client.news_feed_db
-    users_collection = db.users
-    news_collection = db.news
-    user_preferences_collection = db.user_preferences
     print("MongoDB connected successfully")
 except Exception as e:
     print(f"MongoDB connection error: {e}")
 
 NEWS_API_KEY = os.getenv("NEWS_API_KEY", "862309ce6bc0435383c01db4ed148b11")
+# e.g. http://127.0.0.1:8099/v2 for news/mock_newsapi.py
+NEWS_API_BASE_URL = os.getenv("NEWS_API_BASE_URL", DEFAULT_BASE_URL)
+INGEST_COUNTRIES = [c.strip() for c in os.getenv("INGEST_COUNTRIES", "us").split(",") if c.strip()]
+INGEST_INTERVAL_MINUTES = int(os.getenv("INGEST_INTERVAL_MINUTES", "120"))
+SEARCH_INDEX_SYNC_SECONDS = int(os.getenv("SEARCH_INDEX_SYNC_SECONDS", "60"))
+LOCAL_CORPUS_MAX_AGE = timedelta(hours=int(os.getenv("LOCAL_CORPUS_MAX_AGE_HOURS", "24")))
+
+# NewsAPI budget: refill the daily allowance evenly, allow short bursts.
+# The bucket lives in Mongo and is shared by all workers, so the leader's
+# ingestion sweeps can use the whole background share. NEWSAPI_WORKERS
+# (uvicorn's WEB_CONCURRENCY by default) only splits the budget while Mongo
+# is unreachable and each worker falls back to a bucket of its own.
+NEWSAPI_DAILY_BUDGET = int(os.getenv("NEWSAPI_DAILY_BUDGET", "100"))
+NEWSAPI_BURST = int(os.getenv("NEWSAPI_BURST", "20"))
+NEWSAPI_WORKERS = max(1, int(os.getenv("NEWSAPI_WORKERS", os.getenv("WEB_CONCURRENCY", "1"))))
+newsapi_quota = SharedQuotaManager(
+    db.newsapi_quota,
+    capacity=NEWSAPI_BURST,
+    refill_per_second=NEWSAPI_DAILY_BUDGET / 86400,
+    fallback_workers=NEWSAPI_WORKERS,
+)
+# a slow or failing NewsAPI must not hold requests hostage: each request
+# gets one upstream budget, and repeated failures skip upstream entirely
+NEWSAPI_TIMEOUT_SECONDS = float(os.getenv("NEWSAPI_TIMEOUT_SECONDS", "10"))
+newsapi_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("NEWSAPI_BREAKER_FAILURES", "5")),
+    reset_timeout=float(os.getenv("NEWSAPI_BREAKER_RESET_SECONDS", "30")),
+)
+newsapi_client = NewsAPIClient(
+    NEWS_API_KEY, NEWS_API_BASE_URL, timeout=NEWSAPI_TIMEOUT_SECONDS, quota=newsapi_quota, breaker=newsapi_breaker
+)
+ARTICLE_RETENTION_DAYS = int(os.getenv("ARTICLE_RETENTION_DAYS", "7"))
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "archive"))
+retention = ArticleRetention(news_collection, db.user_articles, ARCHIVE_DIR, retention_days=ARTICLE_RETENTION_DAYS)
+ingestor = NewsIngestor(news_collection, newsapi_client, countries=INGEST_COUNTRIES, expire_after=retention.ttl)
+search_index = BM25Index()
+retention.on_remove.append(search_index.remove_many)
+ingestor.on_ingest.append(search_index.add_many)
+# user-typed searches outweigh words that merely appear in headlines
+USER_KEYWORD_WEIGHT = 5
+suggester = PrefixSuggester()
+ingestor.on_ingest.append(suggester.add_articles)
 SECRET_KEY = os.getenv("SECRET_KEY", "qwerty@123")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+MAX_PAGE_SIZE = 100
+INTERACTION_FLUSH_SECONDS = int(os.getenv("INTERACTION_FLUSH_SECONDS", "5"))
+FEED_CACHE_TTL_SECONDS = int(os.getenv("FEED_CACHE_TTL_SECONDS", "300"))
+FEED_PREWARM_MAX_USERS = int(os.getenv("FEED_PREWARM_MAX_USERS", "50"))
+# short enough that an entry is caught before it expires, whatever the feed TTL
+FEED_PREWARM_INTERVAL_SECONDS = max(5, min(60, FEED_CACHE_TTL_SECONDS // 4))
+CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", str(os.cpu_count() or 2)))
+CPU_POOL_MAX_QUEUE = int(os.getenv("CPU_POOL_MAX_QUEUE", "64"))
+
+# Password hashing and NLP scoring run here instead of on the event loop;
+# when the backlog is full requests are shed with a 503.
+cpu_pool = CPUExecutor(max_workers=CPU_POOL_WORKERS, max_queue=CPU_POOL_MAX_QUEUE)
+
+# Personalized feeds per user, dropped whenever the user's profile or
+# preferences change; recent_feed_users drives the scheduled pre-warm.
+feed_cache = TTLCache(maxsize=2000, ttl=FEED_CACHE_TTL_SECONDS)
+recent_feed_users = TTLCache(maxsize=5000, ttl=30 * 60)
 
 # Security
 security = HTTPBearer()
+auth_logger = logging.getLogger("news_api.auth")
+AUTH_LOG_SAMPLE_RATE = float(os.getenv("AUTH_LOG_SAMPLE_RATE", "0.01"))
+# verified tokens keyed by their SHA-256, each kept until the token's exp
+token_cache = TTLCache(maxsize=10000, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
 
 # Pydantic models
 class UserRegister(BaseModel):
@@ -112,11 +402,25 @@ class Article(BaseModel):
     category: str
     explanation: Optional[str] = ""
 
+class InteractionArticle(BaseModel):
+    """Article fields a client may send along with an interaction to skip the lookup."""
+    title: Optional[str] = None
+    description: Optional[str] = None
+    category: Optional[str] = None
+    source: Optional[str] = None
+
 class NewsFilter(BaseModel):
     categories: Optional[List[str]] = []
     keywords: Optional[str] = ""
     locations: Optional[List[str]] = None
     limit: Optional[int] = 40
+    cursor: Optional[str] = None
+
+class FeedRequest(BaseModel):
+    categories: Optional[List[str]] = []
+    keywords: Optional[str] = ""
+    locations: Optional[List[str]] = None
+    limit: Optional[int] = 40
 
 
 def create_access_token(data: dict):
@@ -126,52 +430,50 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def _auth_log(level: int, message: str, *args):
+    """Log auth events, sampling everything below WARNING to keep the hot path quiet."""
+    if level < logging.WARNING and random.random() >= AUTH_LOG_SAMPLE_RATE:
+        return
+    auth_logger.log(level, message, *args)
+
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    try:
-        print(f"Verifying token: {credentials.credentials[:20]}...")
-        payload = jwt.decode(
-            credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM]
-        )
-        print(f"Token payload: {payload}")
-        user_id = payload.get("sub")
-        print(f"User ID from token: {user_id}")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
+    token = credentials.credentials
+    cache_key = hashlib.sha256(token.encode()).hexdigest()
+    user_id = token_cache.get(cache_key)
+    if user_id is not None:
         return user_id
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except jwt.PyJWTError as e:
-        print(f"JWT Error: {e}")
+        _auth_log(logging.WARNING, "Rejected token: %s", e)
         raise HTTPException(status_code=401, detail="Invalid token")
     except Exception as e:
-        print(f"Unexpected error in verify_token: {e}")
+        _auth_log(logging.ERROR, "Unexpected error in verify_token: %s", e)
         raise HTTPException(status_code=401, detail="Token verification failed")
 
-def _convert_object_ids(data):
-    """Recursively convert MongoDB types to JSON-serializable values."""
-    if isinstance(data, list):
-        return [_convert_object_ids(item) for item in data]
-    if isinstance(data, dict):
-        result = {}
-        for key, value in data.items():
-            if key == "_id":
-                continue
-            result[key] = _convert_object_ids(value)
-        return result
-    if isinstance(data, (ObjectId, datetime)):
-        return str(data)
-    return data
+    user_id = payload.get("sub")
+    if user_id is None:
+        _auth_log(logging.WARNING, "Rejected token without subject")
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    # jwt.decode already rejected expired tokens, so the entry lives until exp
+    ttl = payload.get("exp", 0) - time.time()
+    if ttl > 0:
+        token_cache.set(cache_key, user_id, ttl=ttl)
+    _auth_log(logging.DEBUG, "Verified token for user %s", user_id)
+    return user_id
+
+def verify_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    return True
 
 def get_user_by_id(user_id: str):
-    print(f"Looking up user by ID: {user_id}")
     try:
-        user = users_collection.find_one({"user_id": user_id})
-        print(f"User lookup result: {type(user)}")
-        if user:
-            print(
-                f"User found: {user.get('username', 'No username') if isinstance(user, dict) else 'User is not dict'}"
-            )
-        else:
-            print("No user found")
-        
+        user = user_docs.get(user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -185,6 +487,118 @@ def get_user_by_id(user_id: str):
     except Exception as e:
         print(f"Error in get_user_by_id: {e}")
         raise
+
+
+PROFILE_FIELDS = ("categories", "sources", "keywords", "locations")
+
+
+def _load_interest_profile(user: dict) -> dict:
+    """Build the Counter-based interest profile stored on a user document."""
+    stored = (user or {}).get("interest_profile", {}) or {}
+    return {
+        field: Counter({unescape_key(k): v for k, v in (stored.get(field) or {}).items()})
+        for field in PROFILE_FIELDS
+    }
+
+
+def _profile_inc_ops(delta: dict) -> dict:
+    """Translate a profile delta into ``$inc`` operations on the touched keys only."""
+    ops = {}
+    for field in PROFILE_FIELDS:
+        for key, value in (delta.get(field) or {}).items():
+            if key and value:
+                ops[f"interest_profile.{field}.{escape_key(key)}"] = value
+    return ops
+
+
+def _apply_profile_deltas(deltas: dict) -> int:
+    """Write coalesced per-user profile deltas as one unordered bulk ``$inc``."""
+    operations, targets = [], []
+    for user_id, delta in deltas.items():
+        inc_ops = _profile_inc_ops(delta)
+        if inc_ops:
+            # profile_version lets every worker tell that its cached feed is out of date
+            operations.append(UpdateOne({"user_id": user_id}, {"$inc": dict(inc_ops, profile_version=1)}))
+            targets.append(user_id)
+    failed = {}
+    if operations:
+        try:
+            users_collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # unordered: every operation without a write error was applied
+            failed = {targets[error["index"]]: deltas[targets[error["index"]]]
+                      for error in e.details.get("writeErrors", [])}
+        try:
+            global_stats.record(delta for user_id, delta in deltas.items() if user_id not in failed)
+        except Exception as e:
+            # profiles are already written; the daily rebuild corrects the counts
+            print(f"Error recording global stats: {e}")
+    for user_id in deltas:
+        user_docs.invalidate(user_id)
+        feed_cache.invalidate(user_id)
+    if failed:
+        raise PartialFlush(failed, len(operations) - len(failed))
+    return len(operations)
+
+
+def _load_interaction_articles(article_ids: List[str]) -> dict:
+    """Fields the profile NLP needs for a flush batch, keyed by article_id."""
+    return {
+        doc["article_id"]: doc
+        for doc in news_collection.find({"article_id": {"$in": article_ids}}, INTERACTION_PROJECTION)
+    }
+
+
+def _append_interactions(events: List[dict]) -> List[dict]:
+    """Flush buffered log entries and the list side effects kept off the request path."""
+    failed = interaction_log.append_many(events)
+    interaction_log.sync_recent(events)
+    # pin before releasing, so an article saved and unsaved in one batch ends up unpinned
+    retention.pin_many({event["article_id"] for event in events if event["action"] in ("save", "like")})
+    retention.release_many({event["article_id"] for event in events if event["action"] == "unsave"})
+    return failed
+
+
+def _request_interaction_flush():
+    """Run the scheduled flush job now rather than at its next interval."""
+    try:
+        scheduler.modify_job("flush_interactions", next_run_time=datetime.now())
+    except JobLookupError:
+        # scheduler not started (or already shut down): flush in the background instead
+        threading.Thread(target=interaction_queue.flush, name="interaction-flush", daemon=True).start()
+
+
+interaction_queue = InteractionQueue(_apply_profile_deltas, append_log=_append_interactions,
+                                     request_flush=_request_interaction_flush,
+                                     load_articles=_load_interaction_articles)
+metrics.gauge("interaction_queue_depth", "Buffered interaction events awaiting flush.", interaction_queue.depth)
+metrics.gauge("cpu_pool_queue_depth", "CPU pool tasks waiting for a worker.", lambda: cpu_pool.stats()["queue_depth"])
+metrics.gauge("newsapi_circuit_open", "1 while the NewsAPI circuit breaker is open or probing.",
+              lambda: newsapi_breaker.state != CLOSED)
+
+# tracemalloc frames per allocation; 0 leaves tracing off until an admin enables it
+MEMORY_TRACE_FRAMES = int(os.getenv("MEMORY_TRACE_FRAMES", "0"))
+memory_tracker = MemoryTracker()
+if MEMORY_TRACE_FRAMES:
+    memory_tracker.start_tracing(MEMORY_TRACE_FRAMES)
+for name, component in {
+    "feed_cache": feed_cache,
+    "recent_feed_users": recent_feed_users,
+    "auth_cache": token_cache,
+    "user_cache": user_docs,
+    "preferences_cache": preference_docs,
+    "interaction_queue": interaction_queue,
+    "global_stats": global_stats,
+    "search_index": search_index,
+    "suggester": suggester,
+    "stop_words": STOP_WORDS,
+    "metrics": metrics,
+}.items():
+    memory_tracker.register(name, lambda component=component: component)
+metrics.gauge("process_resident_memory_bytes", "Resident set size of this worker.",
+              lambda: process_memory()["rss_bytes"])
+INTERACTION_PROJECTION = {"_id": 0, "article_id": 1, "title": 1, "description": 1, "category": 1, "source": 1}
+
 @app.post("/api/auth/register")
 async def register_user(user: UserRegister):
     if users_collection.find_one({"username": user.username}):
@@ -198,10 +612,11 @@ async def register_user(user: UserRegister):
         "user_id": user_id,
         "username": user.username,
         "email": user.email,
-        "password": generate_password_hash(user.password),
+        "password": await cpu_pool.run(generate_password_hash, user.password),
         "created_at": datetime.now(),
         "saved_articles": [],
         "liked_articles": [],
+        "interactions_migrated": True,
         "interest_profile": {
             "categories": {cat: 1 for cat in (user.categories or [])},
             "sources": {},
@@ -211,6 +626,7 @@ async def register_user(user: UserRegister):
     }
     
     users_collection.insert_one(new_user)
+    global_stats.record([{"categories": new_user["interest_profile"]["categories"]}])
     
     default_preferences = {
         "user_id": user_id,
@@ -224,17 +640,17 @@ async def register_user(user: UserRegister):
     }
     user_preferences_collection.insert_one(default_preferences)
     
-    return _convert_object_ids({"message": "User registered successfully", "user_id": user_id})
+    return {"message": "User registered successfully", "user_id": user_id}
 
 @app.post("/api/auth/login")
 async def login_user(user: UserLogin):
     user_data = users_collection.find_one({"username": user.username})
-    if not user_data or not check_password_hash(user_data["password"], user.password):
+    if not user_data or not await cpu_pool.run(check_password_hash, user_data["password"], user.password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     access_token = create_access_token(data={"sub": user_data["user_id"]})
     
-    return _convert_object_ids({
+    return {
         "access_token": access_token,
         "token_type": "bearer",
         "user": {
@@ -242,114 +658,156 @@ async def login_user(user: UserLogin):
             "username": user_data["username"],
             "email": user_data["email"]
         }
-    })
+    }
 
 # News endpoints
 @app.post("/api/news/fetch")
 async def fetch_news(filters: NewsFilter, user_id: str = Depends(verify_token)):
-    news_articles = []
-
-    categories_to_fetch = filters.categories or ["general"]
-
-    keyword_query = ""
     if filters.keywords:
-        kw_list = extract_keywords(filters.keywords)
-        keyword_query = " OR ".join(kw_list) if kw_list else filters.keywords
-
         # persist search keywords to the user's interest profile so future
         # recommendations can leverage them
-        user = users_collection.find_one({"user_id": user_id}) or {}
-        profile = {
-            "categories": Counter(user.get("interest_profile", {}).get("categories", {})),
-            "sources": Counter(user.get("interest_profile", {}).get("sources", {})),
-            "keywords": Counter(user.get("interest_profile", {}).get("keywords", {})),
-            "locations": Counter(user.get("interest_profile", {}).get("locations", {})),
-        }
         pseudo = {"category": None, "source": None, "title": filters.keywords, "description": ""}
-        profile = increment_interest_profile(profile, pseudo)
-        users_collection.update_one(
-            {"user_id": user_id},
-            {
-                "$set": {
-                    "interest_profile.categories": dict(profile["categories"]),
-                    "interest_profile.sources": dict(profile["sources"]),
-                    "interest_profile.keywords": dict(profile["keywords"]),
-                    "interest_profile.locations": dict(profile["locations"]),
-                }
-            },
-        )
+        interaction_queue.enqueue(user_id, pseudo)
+        suggester.add_text(filters.keywords, USER_KEYWORD_WEIGHT)
+
+    return FastJSONResponse(await asyncio.to_thread(_fetch_news_articles, filters))
+
+
+def _category_articles(category: str, keyword_stems: List[str], query: str, limit: int,
+                       country: Optional[str] = None) -> List[dict]:
+    """Serve a category from the local corpus, falling back to a live NewsAPI call."""
+    with metrics.stage("mongo"):
+        articles = ingestor.query_local(category, keyword_stems, limit, max_age=LOCAL_CORPUS_MAX_AGE)
+    if articles:
+        return articles
+    try:
+        return _live_category_articles(category, query, limit, country)
+    except NewsAPIError as e:
+        # over budget or upstream refused: stale local articles beat none
+        with metrics.stage("mongo"):
+            stale = ingestor.query_local(category, keyword_stems, limit)
+        if stale:
+            print(f"Serving stale articles for {category}: {e}")
+            return stale
+        raise
+
+
+def _live_category_articles(category: str, query: str, limit: int, country: Optional[str] = None) -> List[dict]:
+    """Fetch a category straight from NewsAPI and store it in the local corpus."""
+    with metrics.stage("upstream"):
+        raw_articles = newsapi_client.top_headlines(category=category, country=country, q=query, page_size=limit)
+    with metrics.stage("keywords"):
+        normalized = [a for a in (normalize_article(raw, category, country) for raw in raw_articles[:limit]) if a]
+    with metrics.stage("mongo"):
+        return ingestor.store(normalized)
+
+
+def _fetch_news_articles(filters: NewsFilter) -> dict:
+    """Return one page of matching articles, newest first, with a cursor for the next."""
+    categories_to_fetch = filters.categories or ["general"]
+    page_size = max(1, min(filters.limit or 40, MAX_PAGE_SIZE))
+    try:
+        after = decode_cursor(filters.cursor, {"p": str, "id": str}) if filters.cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # pages after one served from the any-age fallback keep using that query
+    max_age = LOCAL_CORPUS_MAX_AGE
+    if after is not None:
+        if not isinstance(after.get("all", False), bool):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if after.get("all"):
+            max_age = None
+
+    keyword_query = ""
+    keyword_stems: List[str] = []
+    with metrics.stage("keywords"):
+        if filters.keywords:
+            kw_list = extract_keywords(filters.keywords)
+            keyword_stems.extend(kw_list)
+            keyword_query = " OR ".join(kw_list) if kw_list else filters.keywords
 
-    for category in categories_to_fetch:
-        url = f"https://newsapi.org/v2/top-headlines?category={category}&apiKey={NEWS_API_KEY}"
-        
         query_parts = []
         if keyword_query:
             query_parts.append(keyword_query)
         if filters.locations:
             query_parts.append(" OR ".join(filters.locations))
-        if query_parts:
-            query = " ".join(query_parts)
-            print("Final NewsAPI URL:", url)
-            url += "&q=" + quote_plus(query)
-        
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            news_data = response.json()
-            
-            if not isinstance(news_data, dict):
-                raise HTTPException(status_code=500, detail="Invalid response format from news API")
-            
-            if news_data.get("status") == "ok" and "articles" in news_data:
-                articles = news_data.get("articles", [])
-                if not isinstance(articles, list):
-                    continue
-                    
-                for article in articles[:filters.limit//len(categories_to_fetch)]:
-                    if not isinstance(article, dict):
-                        continue
-                        
-                    article_id = str(uuid.uuid4())
-                    
-                    source_info = article.get("source", {})
-                    source_name = "Unknown"
-                    if isinstance(source_info, dict):
-                        source_name = source_info.get("name", "Unknown")
-                    elif isinstance(source_info, str):
-                        source_name = source_info
-                    
-                    article_data = {
-                        "article_id": article_id,
-                        "title": article.get("title", "No Title") if isinstance(article.get("title"), str) else "No Title",
-                        "description": article.get("description", "No Description") if isinstance(article.get("description"), str) else "No Description",
-                        "url": article.get("url", "#") if isinstance(article.get("url"), str) else "#",
-                        "urlToImage": article.get("urlToImage", "") if isinstance(article.get("urlToImage"), str) else "",
-                        "publishedAt": article.get("publishedAt", "") if isinstance(article.get("publishedAt"), str) else "",
-                        "source": source_name,
-                        "category": category,
-                        "explanation": f"Matched category '{category}'" + (f" and keywords '{filters.keywords}'" if filters.keywords else ""),
-                        "created_at": datetime.now()
-                    }
-                    
-                    existing = news_collection.find_one({"title": article_data["title"]})
-                    if not existing:
-                        news_collection.insert_one(article_data)
-                    else:
-                        article_id = existing["article_id"]
-                        article_data["article_id"] = article_id
-                    
-                    news_articles.append(article_data)
-            else:
-                print(f"API Error for category {category}: {news_data.get('message', 'Unknown error')}")
-                    
-        except requests.RequestException as e:
-            print(f"Request error for category {category}: {str(e)}")
-            continue
-        except Exception as e:
-            print(f"Error fetching news for category {category}: {str(e)}")
-            continue
-    
-    return _convert_object_ids({"articles": news_articles})
+            keyword_stems.extend(extract_keywords(" ".join(filters.locations)))
+        query = " ".join(query_parts)
+
+    # fetch one extra row to learn whether another page exists
+    with metrics.stage("mongo"):
+        articles = ingestor.query_page(categories_to_fetch, keyword_stems, page_size + 1, max_age, after)
+    if not articles and after is None:
+        # nothing local matches yet, so pull each category live once
+        live_articles = []
+        per_category = max(1, page_size // len(categories_to_fetch))
+        for category in categories_to_fetch:
+            try:
+                live_articles.extend(_live_category_articles(category, query, per_category))
+            except UpstreamUnavailable as e:
+                # the remaining categories would fail the same way
+                print(f"NewsAPI unavailable, serving local articles: {e}")
+                break
+            except NewsAPIError as e:
+                print(f"API Error for category {category}: {e}")
+            except requests.RequestException as e:
+                print(f"Request error for category {category}: {str(e)}")
+            except Exception as e:
+                print(f"Error fetching news for category {category}: {str(e)}")
+        with metrics.stage("mongo"):
+            articles = ingestor.query_page(categories_to_fetch, keyword_stems, page_size + 1, LOCAL_CORPUS_MAX_AGE)
+            if not articles:
+                # NewsAPI matched on full text our stored stems don't cover
+                articles = list({a["article_id"]: a for a in live_articles}.values())[:page_size]
+            if not articles:
+                # upstream unavailable or over budget: fall back to older local articles
+                max_age = None
+                articles = ingestor.query_page(categories_to_fetch, keyword_stems, page_size + 1)
+
+    next_cursor = None
+    if len(articles) > page_size:
+        articles = articles[:page_size]
+        last = articles[-1]
+        position = {"p": last.get("publishedAt", ""), "id": last["article_id"]}
+        if max_age is None:
+            position["all"] = True
+        next_cursor = encode_cursor(position)
+
+    explanation_suffix = f" and keywords '{filters.keywords}'" if filters.keywords else ""
+    for article in articles:
+        matched = next(
+            (c for c in article.get("categories") or [] if c in categories_to_fetch), article.get("category")
+        )
+        article["explanation"] = f"Matched category '{matched}'" + explanation_suffix
+
+    return {"articles": articles, "next_cursor": next_cursor}
+
+@app.get("/api/news/search")
+async def search_news(
+    q: str,
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 20,
+    user_id: str = Depends(verify_token),
+):
+    if page < 1 or not 1 <= page_size <= 100:
+        raise HTTPException(status_code=400, detail="Invalid pagination parameters")
+    total, hits = await cpu_pool.run(
+        search_index.search, q, category, source, from_date, to_date, offset=(page - 1) * page_size, limit=page_size
+    )
+    scores = dict(hits)
+    articles = await asyncio.to_thread(_articles_by_ids, list(scores))
+    for article in articles:
+        article["score"] = scores[article["article_id"]]
+    return FastJSONResponse({"articles": articles, "total": total, "page": page, "page_size": page_size})
+
+@app.get("/api/news/suggest")
+async def suggest_keywords(prefix: str, limit: int = 10):
+    limit = max(1, min(limit, MAX_SUGGESTIONS))
+    return {"prefix": prefix, "suggestions": suggester.suggest(prefix, limit)}
 
 @app.get("/api/news/categories")
 async def get_news_categories():
@@ -358,75 +816,35 @@ async def get_news_categories():
 
 def _fetch_trending_news(limit: int = 10):
     """Fetch trending articles with their categories."""
-    categories = [
-        "business",
-        "entertainment",
-        "general",
-        "health",
-        "science",
-        "sports",
-        "technology",
-    ]
-
-    per_cat = max(1, limit // len(categories))
+    per_cat = max(1, limit // len(NEWS_CATEGORIES))
     news_articles: List[dict] = []
+    seen_ids = set()
 
-    for category in categories:
-        url = (
-            f"https://newsapi.org/v2/top-headlines?country=us&category={category}&apiKey={NEWS_API_KEY}"
-        )
+    for category in NEWS_CATEGORIES:
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            news_data = response.json()
-            if news_data.get("status") == "ok" and "articles" in news_data:
-                articles = news_data.get("articles", [])
-                for article in articles[:per_cat]:
-                    if not isinstance(article, dict):
-                        continue
-                    article_id = str(uuid.uuid4())
-                    source_info = article.get("source", {})
-                    source_name = (
-                        source_info.get("name", "Unknown") if isinstance(source_info, dict) else source_info
-                    )
-                    article_data = {
-                        "article_id": article_id,
-                        "title": article.get("title", "No Title"),
-                        "description": article.get("description", "No Description"),
-                        "url": article.get("url", "#"),
-                        "urlToImage": article.get("urlToImage", ""),
-                        "publishedAt": article.get("publishedAt", ""),
-                        "source": source_name,
-                        "category": category,
-                        "explanation": "Trending article",
-                        "created_at": datetime.now(),
-                    }
-                    existing = news_collection.find_one({"title": article_data["title"]})
-                    if not existing:
-                        news_collection.insert_one(article_data)
-                    else:
-                        article_id = existing["article_id"]
-                        article_data["article_id"] = article_id
-                    news_articles.append(article_data)
+            articles = _category_articles(category, [], "", per_cat, country="us")
         except Exception as e:
             print(f"Error fetching trending news for {category}: {e}")
+            continue
+        for article in articles:
+            # a story listed under several categories comes back for each of them
+            if article["article_id"] in seen_ids:
+                continue
+            seen_ids.add(article["article_id"])
+            article["explanation"] = "Trending article"
+            news_articles.append(article)
 
     return news_articles[:limit]
 
-def _get_global_category_source_rankings(limit: int = 5):
+def _get_global_category_source_rankings(limit: int = 5, window: Optional[str] = None):
     """Return most popular categories and sources across all users."""
-    cat_counter = Counter()
-    src_counter = Counter()
     try:
-        for user in users_collection.find({}, {"interest_profile": 1}):
-            profile = user.get("interest_profile", {})
-            cat_counter.update(profile.get("categories", {}))
-            src_counter.update(profile.get("sources", {}))
+        return global_stats.top(limit, window)
+    except ValueError:
+        raise
     except Exception as e:
         print(f"Error computing global rankings: {e}")
-    top_categories = [c for c, _ in cat_counter.most_common(limit)]
-    top_sources = [s for s, _ in src_counter.most_common(limit)]
-    return top_categories, top_sources
+        return [], []
 
 
 def _rank_categories_with_tfidf(user_profile: dict, preferences: dict) -> List[str]:
@@ -443,7 +861,7 @@ def _rank_categories_with_tfidf(user_profile: dict, preferences: dict) -> List[s
 
     category_docs = {}
     for cat in all_categories:
-        docs = news_collection.find({"category": cat})
+        docs = news_collection.find({"categories": cat}, {"_id": 0, "title": 1, "description": 1})
         text_parts = []
         for d in docs:
             if isinstance(d, dict):
@@ -462,37 +880,96 @@ def _rank_categories_with_tfidf(user_profile: dict, preferences: dict) -> List[s
 
 @app.get("/api/news/explore")
 async def get_explore_news(limit: int = 10):
-    articles = _fetch_trending_news(limit)
-    return _convert_object_ids({"articles": articles})
+    articles = await asyncio.to_thread(_fetch_trending_news, limit)
+    return {"articles": articles}
+
+
+@app.get("/api/news/popular")
+async def get_popular_topics(limit: int = 5, window: Optional[str] = None):
+    try:
+        categories, sources = _get_global_category_source_rankings(limit, window)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"categories": categories, "sources": sources, "window": window or "all"}
+
+
+def _feed_sort_key(article: dict) -> tuple:
+    return (article.get("score", 0), article.get("publishedAt", ""), article.get("article_id", ""))
 
 
 @app.get("/api/news/personalized")
-async def get_personalized_news(user_id: str = Depends(verify_token)):
+async def get_personalized_news(
+    cursor: Optional[str] = None,
+    page_size: int = 20,
+    user_id: str = Depends(verify_token),
+):
+    recent_feed_users.set(user_id, True)
+    result = await asyncio.to_thread(_personalized_feed, user_id)
+    # the ranked feed is cached whole; pages are keyset slices of it
+    try:
+        articles, next_cursor = page_after(
+            result["articles"], _feed_sort_key, cursor, max(1, min(page_size, MAX_PAGE_SIZE))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse({"articles": articles, "next_cursor": next_cursor})
+
+
+def _feed_version(user_id: str) -> tuple:
+    """What a cached feed depends on, from the (change-stream or TTL bounded) document caches.
+
+    Interaction flushes and preference saves on any worker change it, so a
+    feed cached here is dropped even when the invalidation ran elsewhere.
+    """
+    user = user_docs.get(user_id) or {}
+    preferences = preference_docs.get(user_id) or {}
+    return user.get("profile_version", 0), preferences.get("updated_at")
+
+
+def _cached_feed(user_id: str) -> tuple:
+    """Return the user's cached feed if it is still current, and the version a rebuild should store."""
+    version = _feed_version(user_id)
+    feed = feed_cache.get(user_id)
+    if feed is not None and feed.get("version") != version:
+        feed = None
+    return feed, version
+
+
+def _personalized_feed(user_id: str) -> dict:
+    """The user's cached feed, rebuilt when missing or out of date."""
+    # read before the build: an invalidation during it must win over the result
+    generation = feed_cache.generation()
+    feed, version = _cached_feed(user_id)
+    if feed is None:
+        feed = dict(_build_personalized_feed(user_id), version=version)
+        feed_cache.set(user_id, feed, generation=generation)
+    return feed
+
+
+def _personalization_plan(user_id: str):
+    """Resolve a user's preferences, profile and the categories/keywords to fetch."""
     # Step 1: Fetch user preferences and profile
-    preferences = user_preferences_collection.find_one({"user_id": user_id}) or {
-        "categories": [],
-        "keywords": "",
-        "locations": [],
-        "share_read_time": False,
-        "experimental_opt_in": False,
-    }
+    with metrics.stage("mongo"):
+        preferences = preference_docs.get(user_id) or {
+            "categories": [],
+            "keywords": "",
+            "locations": [],
+            "share_read_time": False,
+            "experimental_opt_in": False,
+        }
 
-    user = get_user_by_id(user_id)
-    user_profile = {
-        "categories": Counter(user.get("interest_profile", {}).get("categories", {})),
-        "sources": Counter(user.get("interest_profile", {}).get("sources", {})),
-        "keywords": Counter(user.get("interest_profile", {}).get("keywords", {})),
-        "locations": Counter(user.get("interest_profile", {}).get("locations", {})),
-    }
+        user = get_user_by_id(user_id)
+    user_profile = _load_interest_profile(user)
 
     # Step 2: Analyze activity if no preferences
-    rec_data = analyze_activity(user_profile, preferences)
+    with metrics.stage("analyze"):
+        rec_data = analyze_activity(user_profile, preferences)
 
     # Step 3: Only get recommended categories & keywords
     rec_categories = preferences.get("categories") or rec_data.get("categories", [])
     if not rec_categories:
-        rec_categories = _rank_categories_with_tfidf(user_profile, preferences)[:5]
-    rec_keywords = preferences.get("keywords") or " ".join(rec_data.get("keywords", []))
+        with metrics.stage("tfidf"):
+            rec_categories = _rank_categories_with_tfidf(user_profile, preferences)[:5]
 
     pref_kw = preferences.get("keywords", "").strip()
     profile_kw = " ".join(rec_data.get("keywords", []))
@@ -500,6 +977,22 @@ async def get_personalized_news(user_id: str = Depends(verify_token)):
 
     print("🔍 Categories for fetch:", rec_categories)
     print("🔍 Keywords for fetch:", rec_keywords)
+    return preferences, user_profile, rec_categories, rec_keywords
+
+
+def _trending_fill(preferences: dict, articles: List[dict]) -> List[dict]:
+    """Trending articles to mix in when personalized content is thin."""
+    if articles and not (preferences.get("experimental_opt_in") and len(articles) < 10):
+        return []
+    trending = _fetch_trending_news(5)
+    for article in trending:
+        article["explanation"] += " | Trending"
+        article["_score"] = 0
+    return trending
+
+
+def _build_personalized_feed(user_id: str) -> dict:
+    preferences, user_profile, rec_categories, rec_keywords = _personalization_plan(user_id)
 
     # Step 4: Call fetch_news with filtered categories/keywords
     filters = NewsFilter(
@@ -508,35 +1001,173 @@ async def get_personalized_news(user_id: str = Depends(verify_token)):
         locations=[],  # locations not used
         limit=20,
     )
-    result = await fetch_news(filters, user_id)
+    result = _fetch_news_articles(filters)
     articles = result.get("articles", [])
 
     # Step 5: Score articles with recommend_articles
-    articles = recommend_articles(user_profile, articles)
+    with metrics.stage("scoring"):
+        articles = recommend_articles(user_profile, articles)
 
     articles = [a for a in articles if a.get("score", 0) > 0]
 
     # Step 6: Optionally mix in trending if not enough personalized content
-    if preferences.get("experimental_opt_in") and len(articles) < 10:
-        trending = _fetch_trending_news(5)
-        for article in trending:
-            article["explanation"] += " | Trending"
-            article["_score"] = 0
-        articles.extend(trending)
-    
-    if not articles:
-        articles = _fetch_trending_news(5)
-        for article in articles:
-            article["explanation"] += " | Trending"
-            article["_score"] = 0
+    with metrics.stage("trending"):
+        articles.extend(_trending_fill(preferences, articles))
+
+    articles.sort(key=_feed_sort_key, reverse=True)
+    return {"articles": articles}
+
+
+def _ndjson_line(event: dict) -> bytes:
+    return orjson.dumps(event, default=str) + b"\n"
+
+
+@app.get("/api/news/personalized/stream")
+async def stream_personalized_news(user_id: str = Depends(verify_token)):
+    """Stream the personalized feed as NDJSON, one event per scored category.
+
+    Each ``articles`` event carries one category's scored candidates as soon
+    as that category is ready; the final ``complete`` event carries the full
+    ranking as article ids.
+    """
+    recent_feed_users.set(user_id, True)
+    generation = feed_cache.generation()
+    cached, version = await asyncio.to_thread(_cached_feed, user_id)
+    if cached is not None:
+        return StreamingResponse(_cached_feed_events(cached), media_type="application/x-ndjson")
+    # Mongo reads and a full-corpus TF-IDF scan: I/O-bound, so not the CPU pool
+    plan = await asyncio.to_thread(_personalization_plan, user_id)
+    return StreamingResponse(
+        _personalized_feed_events(user_id, generation, version, *plan), media_type="application/x-ndjson"
+    )
 
-    result["articles"] = articles
-    return result
+
+async def _cached_feed_events(feed: dict):
+    articles = feed["articles"]
+    yield _ndjson_line({"type": "articles", "category": None, "articles": articles})
+    yield _ndjson_line({
+        "type": "complete",
+        "cached": True,
+        "article_ids": [a["article_id"] for a in articles],
+        "count": len(articles),
+    })
+
+
+async def _personalized_feed_events(user_id: str, generation: int, version: tuple, preferences: dict,
+                                    user_profile: dict, rec_categories: List[str], rec_keywords: str):
+    keyword_stems = await cpu_pool.run(extract_keywords, rec_keywords) if rec_keywords else []
+    query = " OR ".join(keyword_stems)
+    per_category = max(1, 20 // max(1, len(rec_categories)))
+    explanation_suffix = f" and keywords '{rec_keywords}'" if rec_keywords else ""
+
+    async def score_category(category: str):
+        try:
+            articles = await asyncio.to_thread(_category_articles, category, keyword_stems, query, per_category)
+            for article in articles:
+                article["explanation"] = f"Matched category '{category}'" + explanation_suffix
+            scored = await cpu_pool.run(recommend_articles, user_profile, articles)
+        except Exception as e:
+            print(f"Error streaming news for category {category}: {e}")
+            scored = []
+        return category, [a for a in scored if a.get("score", 0) > 0]
+
+    ranked: List[dict] = []
+    seen_ids = set()
+    tasks = [asyncio.create_task(score_category(category)) for category in rec_categories]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            category, scored = await next_done
+            scored = [a for a in scored if a["article_id"] not in seen_ids]
+            if not scored:
+                continue
+            seen_ids.update(a["article_id"] for a in scored)
+            ranked.extend(scored)
+            yield _ndjson_line({"type": "articles", "category": category, "articles": scored})
+    finally:
+        # the client went away: don't leave scoring work queued on the CPU pool
+        for task in tasks:
+            task.cancel()
+
+    trending = await asyncio.to_thread(_trending_fill, preferences, ranked)
+    if trending:
+        ranked.extend(trending)
+        yield _ndjson_line({"type": "articles", "category": "trending", "articles": trending})
+
+    ranked.sort(key=_feed_sort_key, reverse=True)
+    feed_cache.set(user_id, {"articles": ranked, "version": version}, generation=generation)
+    yield _ndjson_line({
+        "type": "complete",
+        "cached": False,
+        "article_ids": [a["article_id"] for a in ranked],
+        "count": len(ranked),
+    })
+
+
+@app.post("/api/feed")
+async def get_feed(request: FeedRequest, user_id: str = Depends(verify_token)):
+    """Everything one news-feed render needs in a single round trip.
+
+    Persists the selected filters as preferences (only when they changed,
+    so repeat renders keep the cached personalized feed), builds the
+    personalized and general sections concurrently, removes general
+    articles already shown as personalized and marks liked articles.
+    """
+    await asyncio.to_thread(_sync_feed_preferences, user_id, request)
+    recent_feed_users.set(user_id, True)
+
+    general_filters = NewsFilter(
+        categories=request.categories or NEWS_CATEGORIES,
+        keywords=request.keywords or "",
+        locations=request.locations or [],
+        limit=request.limit,
+    )
+    personalized, general = await asyncio.gather(
+        asyncio.to_thread(_personalized_feed, user_id),
+        asyncio.to_thread(_fetch_news_articles, general_filters),
+    )
+
+    personalized_articles, personalized_cursor = page_after(personalized["articles"], _feed_sort_key, None, 20)
+    personalized_ids = {a["article_id"] for a in personalized_articles}
+    general_articles = [a for a in general["articles"] if a["article_id"] not in personalized_ids]
+
+    liked_ids = await asyncio.to_thread(
+        interaction_log.contains, user_id, "liked", [a["article_id"] for a in personalized_articles + general_articles]
+    )
+    personalized_articles = [dict(a, liked=a["article_id"] in liked_ids) for a in personalized_articles]
+    for article in general_articles:
+        article["liked"] = article["article_id"] in liked_ids
+
+    return FastJSONResponse({
+        "personalized": personalized_articles,
+        "personalized_next_cursor": personalized_cursor,
+        "general": general_articles,
+        "general_next_cursor": general["next_cursor"],
+    })
+
+
+def _sync_feed_preferences(user_id: str, request: FeedRequest):
+    """Save the feed's filters as preferences, only when they changed."""
+    stored = preference_docs.get(user_id) or {}
+    locations = request.locations or stored.get("locations", [])
+    selected = UserPreferences(
+        categories=request.categories or [],
+        keywords=request.keywords or "",
+        locations=locations,
+        share_read_time=stored.get("share_read_time", False),
+        experimental_opt_in=stored.get("experimental_opt_in", False),
+    )
+    if any(stored.get(field) != getattr(selected, field) for field in ("categories", "keywords", "locations")):
+        _save_preferences(user_id, selected)
 
 
 @app.get("/api/user/preferences")
 async def get_user_preferences(user_id: str = Depends(verify_token)):
-    preferences = user_preferences_collection.find_one({"user_id": user_id})
+    return await asyncio.to_thread(_load_preferences, user_id)
+
+
+def _load_preferences(user_id: str) -> dict:
+    """Return the user's preferences, storing the defaults on first access."""
+    preferences = preference_docs.get(user_id)
     if not preferences:
         default_preferences = {
             "user_id": user_id,
@@ -548,10 +1179,9 @@ async def get_user_preferences(user_id: str = Depends(verify_token)):
             "updated_at": datetime.now()
         }
         user_preferences_collection.insert_one(default_preferences)
-        return _convert_object_ids(default_preferences)
-    
-    if "_id" in preferences:
-        del preferences["_id"]
+        default_preferences.pop("_id", None)
+        preference_docs.invalidate(user_id)
+        return default_preferences
     
     if "locations" not in preferences:
         preferences["locations"] = []
@@ -560,10 +1190,16 @@ async def get_user_preferences(user_id: str = Depends(verify_token)):
     if "experimental_opt_in" not in preferences:
         preferences["experimental_opt_in"] = False
 
-    return _convert_object_ids(preferences)
+    return preferences
 
 @app.put("/api/user/preferences")
 async def update_user_preferences(preferences: UserPreferences, user_id: str = Depends(verify_token)):
+    await asyncio.to_thread(_save_preferences, user_id, preferences)
+    return {"message": "Preferences updated successfully"}
+
+
+def _save_preferences(user_id: str, preferences: UserPreferences):
+    """Persist preferences and fold them into the user's interest profile."""
     user_preferences_collection.update_one(
         {"user_id": user_id},
         {
@@ -578,14 +1214,8 @@ async def update_user_preferences(preferences: UserPreferences, user_id: str = D
         },
         upsert=True,
     )
-
-    user = users_collection.find_one({"user_id": user_id}) or {}
-    profile = {
-        "categories": Counter(user.get("interest_profile", {}).get("categories", {})),
-        "sources": Counter(user.get("interest_profile", {}).get("sources", {})),
-        "keywords": Counter(user.get("interest_profile", {}).get("keywords", {})),
-        "locations": Counter(user.get("interest_profile", {}).get("locations", {})),
-    }
+    preference_docs.invalidate(user_id)
+    feed_cache.invalidate(user_id)
 
     pseudo_article = {
         "category": None,
@@ -594,195 +1224,213 @@ async def update_user_preferences(preferences: UserPreferences, user_id: str = D
         "description": "",
     }
 
-    for cat in preferences.categories:
-        profile["categories"][cat] += 1
-
-    for loc in preferences.locations:
-        profile["locations"][loc] += 1
-
-    profile = increment_interest_profile(profile, pseudo_article)
-
-    users_collection.update_one(
-        {"user_id": user_id},
-        {
-            "$set": {
-                "interest_profile.categories": dict(profile["categories"]),
-                "interest_profile.sources": dict(profile["sources"]),
-                "interest_profile.keywords": dict(profile["keywords"]),
-                "interest_profile.locations": dict(profile["locations"]),
-            }
-        }
+    delta = {
+        "categories": Counter(preferences.categories),
+        "locations": Counter(preferences.locations or []),
+    }
+    interaction_queue.enqueue(user_id, pseudo_article, delta=delta)
+    suggester.add_text(preferences.keywords, USER_KEYWORD_WEIGHT)
+
+
+def _record_interaction(user_id: str, article_id: str, action: str, interaction: int = 1,
+                        dwell_seconds: Optional[float] = None, article: Optional[InteractionArticle] = None):
+    """Update the user's list now for read-your-writes; everything else is written by the next flush.
+
+    The log entry, recent-id array, pin and profile delta are batched. Without
+    ``article`` the flush loads the article's fields; unknown ids are skipped there.
+    """
+    event = interaction_log.event(user_id, article_id, action, dwell_seconds)
+    interaction_log.apply(event)
+    interaction_queue.enqueue(
+        user_id,
+        dict(article) if article else None,
+        interaction=interaction,
+        log_event=event,
+        article_id=article_id,
     )
 
-    return _convert_object_ids({"message": "Preferences updated successfully"})
-
 
 @app.post("/api/user/save-article/{article_id}")
-async def save_article(article_id: str, user_id: str = Depends(verify_token)):
-    article = news_collection.find_one({"article_id": article_id})
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
-    
-    users_collection.update_one(
-        {"user_id": user_id},
-        {"$addToSet": {"saved_articles": article_id}}
-    )
-
-    user = users_collection.find_one({"user_id": user_id}) or {}
-    profile = {
-        "categories": Counter(user.get("interest_profile", {}).get("categories", {})),
-        "sources": Counter(user.get("interest_profile", {}).get("sources", {})),
-        "keywords": Counter(user.get("interest_profile", {}).get("keywords", {})),
-        "locations": Counter(user.get("interest_profile", {}).get("locations", {})),
-    }
-
-    updated_profile = increment_interest_profile(profile, article)
-
-    users_collection.update_one(
-        {"user_id": user_id},
-        {
-            "$set": {
-                "interest_profile.categories": dict(updated_profile["categories"]),
-                "interest_profile.sources": dict(updated_profile["sources"]),
-                "interest_profile.keywords": dict(updated_profile["keywords"]),
-                "interest_profile.locations": dict(updated_profile["locations"]),
-            }
-        }
-    )
-
-    return _convert_object_ids({"message": "Article saved successfully"})
+async def save_article(
+    article_id: str,
+    article: Optional[InteractionArticle] = None,
+    user_id: str = Depends(verify_token),
+):
+    await asyncio.to_thread(_record_interaction, user_id, article_id, "save", article=article)
+    return {"message": "Article saved successfully"}
 
 @app.post("/api/user/like-article/{article_id}")
-async def like_article(article_id: str, user_id: str = Depends(verify_token)):
-    article = news_collection.find_one({"article_id": article_id})
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
-
-    users_collection.update_one(
-        {"user_id": user_id},
-        {"$addToSet": {"liked_articles": article_id}}
-    )
-
-    user = users_collection.find_one({"user_id": user_id}) or {}
-    profile = {
-        "categories": Counter(user.get("interest_profile", {}).get("categories", {})),
-        "sources": Counter(user.get("interest_profile", {}).get("sources", {})),
-        "keywords": Counter(user.get("interest_profile", {}).get("keywords", {})),
-        "locations": Counter(user.get("interest_profile", {}).get("locations", {})),
-    }
-
-    article["interaction"] = 3
-    updated_profile = increment_interest_profile(profile, article)
-
-    users_collection.update_one(
-        {"user_id": user_id},
-        {
-            "$set": {
-                "interest_profile.categories": dict(updated_profile["categories"]),
-                "interest_profile.sources": dict(updated_profile["sources"]),
-                "interest_profile.keywords": dict(updated_profile["keywords"]),
-                "interest_profile.locations": dict(updated_profile["locations"]),
-            }
-        }
-    )
-
-    return _convert_object_ids({"message": "Article liked"})
+async def like_article(
+    article_id: str,
+    article: Optional[InteractionArticle] = None,
+    user_id: str = Depends(verify_token),
+):
+    await asyncio.to_thread(_record_interaction, user_id, article_id, "like", 3, article=article)
+    return {"message": "Article liked"}
 
 @app.post("/api/user/read-article/{article_id}")
-async def read_article(article_id: str, user_id: str = Depends(verify_token)):
+async def read_article(
+    article_id: str,
+    dwell_seconds: Optional[float] = None,
+    article: Optional[InteractionArticle] = None,
+    user_id: str = Depends(verify_token),
+):
     """Record that a user read an article to improve recommendations."""
-    article = news_collection.find_one({"article_id": article_id})
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
-
-    user = users_collection.find_one({"user_id": user_id}) or {}
-    profile = {
-        "categories": Counter(user.get("interest_profile", {}).get("categories", {})),
-        "sources": Counter(user.get("interest_profile", {}).get("sources", {})),
-        "keywords": Counter(user.get("interest_profile", {}).get("keywords", {})),
-        "locations": Counter(user.get("interest_profile", {}).get("locations", {})),
+    # reads touch no list, so nothing here waits on Mongo
+    _record_interaction(user_id, article_id, "read", 1, dwell_seconds, article)
+    return {"message": "Article read"}
+
+def _article_list_page(user_id: str, name: str, cursor: Optional[str], page_size: int):
+    """Page a user's saved or liked list newest first by (added at, article_id)."""
+    after = None
+    if cursor:
+        after = decode_cursor(cursor, {"t": str, "id": str})
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    entries = interaction_log.page(user_id, name, page_size + 1, after)
+    next_cursor = None
+    if len(entries) > page_size:
+        entries = entries[:page_size]
+        last = entries[-1]
+        next_cursor = encode_cursor({"t": last["at"].isoformat(), "id": last["article_id"]})
+    return [entry["article_id"] for entry in entries], next_cursor
+
+
+def _articles_by_ids(article_ids: List[str]) -> List[dict]:
+    """Load articles with one query, preserving the order of ``article_ids``."""
+    docs = {
+        doc["article_id"]: doc
+        for doc in news_collection.find({"article_id": {"$in": article_ids}}, ARTICLE_PROJECTION)
     }
+    return [docs[aid] for aid in article_ids if aid in docs]
 
-    article["interaction"] = 1
-
-    updated_profile = increment_interest_profile(profile, article)
-
-    users_collection.update_one(
-        {"user_id": user_id},
-        {
-            "$set": {
-                "interest_profile.categories": dict(updated_profile["categories"]),
-                "interest_profile.sources": dict(updated_profile["sources"]),
-                "interest_profile.keywords": dict(updated_profile["keywords"]),
-                "interest_profile.locations": dict(updated_profile["locations"]),
-            }
-        }
-    )
-
-    return _convert_object_ids({"message": "Article read"})
 
 @app.get("/api/user/liked-articles")
-async def get_liked_articles(user_id: str = Depends(verify_token)):
-    user = get_user_by_id(user_id)
-    liked_ids = user.get("liked_articles", []) if isinstance(user, dict) else []
-    liked_articles = []
-    for aid in liked_ids:
-        article = news_collection.find_one({"article_id": aid})
-        if article:
-            if "_id" in article:
-                del article["_id"]
-            liked_articles.append(article)
-    return _convert_object_ids({"liked_articles": liked_articles})
+async def get_liked_articles(
+    cursor: Optional[str] = None,
+    page_size: int = 50,
+    user_id: str = Depends(verify_token),
+):
+    try:
+        page_ids, next_cursor = _article_list_page(user_id, "liked", cursor, page_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse({"liked_articles": _articles_by_ids(page_ids), "next_cursor": next_cursor})
 
 
 @app.get("/api/user/saved-articles")
-async def get_saved_articles(user_id: str = Depends(verify_token)):
+async def get_saved_articles(
+    cursor: Optional[str] = None,
+    page_size: int = 50,
+    user_id: str = Depends(verify_token),
+):
     try:
-        user = get_user_by_id(user_id)
-        
-        print(f"User data type: {type(user)}")
-        print(f"User data: {user}")
-        
-        if not isinstance(user, dict):
-            print(f"ERROR: User is not a dictionary: {type(user)}")
-            return _convert_object_ids({"saved_articles": []})
-        
-        saved_article_ids = user.get("saved_articles", [])
-        print(f"Saved article IDs: {saved_article_ids}, type: {type(saved_article_ids)}")
-        
-        if not isinstance(saved_article_ids, list):
-            print(f"Warning: saved_article_ids is not a list: {type(saved_article_ids)}")
-            saved_article_ids = []
-        
-        saved_articles = []
-        for article_id in saved_article_ids:
-            print(f"Looking for article: {article_id}")
-            article = news_collection.find_one({"article_id": article_id})
-            if article:
-                if "_id" in article:
-                    del article["_id"]  
-                saved_articles.append(article)
-                print(f"Added article: {article.get('title', 'No title')}")
-        
-        print(f"Returning {len(saved_articles)} saved articles")
-        return _convert_object_ids({"saved_articles": saved_articles})
-        
+        page_ids, next_cursor = _article_list_page(user_id, "saved", cursor, page_size)
+        return FastJSONResponse({"saved_articles": _articles_by_ids(page_ids), "next_cursor": next_cursor})
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Error in get_saved_articles: {e}")
-        return _convert_object_ids({"saved_articles": [], "error": str(e)})
+        return {"saved_articles": [], "error": str(e)}
 
 @app.delete("/api/user/saved-articles/{article_id}")
 async def remove_saved_article(article_id: str, user_id: str = Depends(verify_token)):
-    users_collection.update_one(
-        {"user_id": user_id},
-        {"$pull": {"saved_articles": article_id}}
-    )
-    return _convert_object_ids({"message": "Article removed from saved"})
+    await asyncio.to_thread(_remove_saved_article, user_id, article_id)
+    return {"message": "Article removed from saved"}
+
+
+def _remove_saved_article(user_id: str, article_id: str):
+    event = interaction_log.event(user_id, article_id, "unsave")
+    interaction_log.apply(event)
+    interaction_queue.enqueue(user_id, log_event=event)
+
+@app.get("/api/admin/stats")
+async def get_admin_stats(_: bool = Depends(verify_admin)):
+    return {
+        "interaction_queue": interaction_queue.stats(),
+        "feed_cache": feed_cache.stats(),
+        "auth_cache": token_cache.stats(),
+        "user_cache": user_docs.stats(),
+        "preferences_cache": preference_docs.stats(),
+        "ingestion": ingestor.stats(),
+        "newsapi_quota": newsapi_quota.stats(),
+        "newsapi_circuit": newsapi_breaker.stats(),
+        "search_index": search_index.stats(),
+        "suggester": suggester.stats(),
+        "cpu_pool": cpu_pool.stats(),
+        "scheduler": scheduler_lease.stats(),
+        "retention": retention.stats(),
+        "profiler": profiler.stats(),
+        "memory": dict(process_memory(), tracemalloc=memory_tracker.stats()),
+    }
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def get_metrics(_: bool = Depends(verify_admin)):
+    """Prometheus text exposition of request/stage latency histograms and queue gauges."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/admin/jobs")
+async def get_job_runs(job: Optional[str] = None, limit: int = 50, _: bool = Depends(verify_admin)):
+    return {"runs": scheduler_lease.recent_runs(job, max(1, min(limit, 500)))}
+
+def _check_group_by(group_by: str):
+    if group_by not in GROUP_BY:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of {', '.join(GROUP_BY)}")
+
+@app.get("/api/admin/memory")
+async def get_memory_report(
+    limit: int = 20,
+    group_by: str = "lineno",
+    sizes: bool = True,
+    types: bool = False,
+    _: bool = Depends(verify_admin),
+):
+    """RSS, GC state, component sizes and (while tracing) top allocators of this worker."""
+    _check_group_by(group_by)
+    # walking the caches and the tracemalloc snapshot can take a while on a large heap
+    return await asyncio.to_thread(memory_tracker.report, max(1, min(limit, 200)), group_by, sizes, types)
+
+@app.post("/api/admin/memory/tracing")
+async def set_memory_tracing(enabled: bool, frames: int = 1, _: bool = Depends(verify_admin)):
+    if enabled:
+        memory_tracker.start_tracing(max(1, min(frames, 50)))
+    else:
+        memory_tracker.stop_tracing()
+    return memory_tracker.stats()
+
+@app.get("/api/admin/memory/snapshots")
+async def list_memory_snapshots(_: bool = Depends(verify_admin)):
+    return {"snapshots": memory_tracker.snapshots()}
+
+@app.post("/api/admin/memory/snapshots")
+async def take_memory_snapshot(label: Optional[str] = None, _: bool = Depends(verify_admin)):
+    if not memory_tracker.tracing:
+        raise HTTPException(status_code=409, detail="Memory tracing is off")
+    label = await asyncio.to_thread(memory_tracker.snapshot, label)
+    return {"label": label, "snapshots": memory_tracker.snapshots()}
+
+@app.get("/api/admin/memory/diff")
+async def get_memory_diff(
+    since: str,
+    until: Optional[str] = None,
+    limit: int = 20,
+    group_by: str = "lineno",
+    _: bool = Depends(verify_admin),
+):
+    """Allocation growth from snapshot ``since`` to snapshot ``until`` (default: now)."""
+    _check_group_by(group_by)
+    try:
+        changes = await asyncio.to_thread(memory_tracker.diff, since, until, max(1, min(limit, 200)), group_by)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown snapshot {e.args[0]}")
+    except RuntimeError:
+        raise HTTPException(status_code=409, detail="Memory tracing is off")
+    return {"since": since, "until": until or "now", "changes": changes}
 
 # Health check
 @app.get("/api/health")
 async def health_check():
-    return _convert_object_ids({"status": "healthy", "timestamp": datetime.now()})
+    return {"status": "healthy", "timestamp": datetime.now()}
 
 if __name__ == "__main__":
     import uvicorn
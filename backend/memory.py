@@ -0,0 +1,196 @@
+# backend/memory.py
+"""Memory reporting for a long-running worker process.
+
+``MemoryTracker`` combines three views:
+- process RSS and garbage-collector state, which are always available;
+- estimated deep sizes of registered in-process structures (caches,
+  indexes, NLP data);
+- tracemalloc top allocators and diffs between named snapshots. These are
+  only available while tracing is on, because tracing slows allocations
+  down.
+
+Each worker process has its own memory, so the report covers only the
+worker that served the request.
+"""
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter, OrderedDict, deque
+from datetime import datetime, timezone
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any, Callable, Dict, Optional
+
+from pymongo.collection import Collection
+from pymongo.database import Database
+from pymongo.mongo_client import MongoClient
+
+GROUP_BY = ("filename", "lineno", "traceback")
+# shared runtime objects that would otherwise pull most of the heap into a component's size
+SHARED_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType,
+                threading.Thread, Collection, Database, MongoClient)
+IGNORED_FILES = ("<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>",
+                 tracemalloc.__file__)
+
+
+def deep_sizeof(root: Any, max_objects: int = 2_000_000) -> dict:
+    """Estimate the bytes reachable from ``root``, not following shared runtime objects.
+
+    Objects shared with other structures (interned strings, small ints) are
+    counted in every structure that reaches them.
+    """
+    seen = set()
+    pending = deque([root])
+    total = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or (obj is not root and isinstance(obj, SHARED_TYPES)):
+            continue
+        seen.add(id(obj))
+        if len(seen) > max_objects:
+            return {"bytes": total, "objects": len(seen) - 1, "truncated": True}
+        total += sys.getsizeof(obj, 0)
+        pending.extend(gc.get_referents(obj))
+    return {"bytes": total, "objects": len(seen), "truncated": False}
+
+
+def process_memory() -> dict:
+    """Current and peak resident set size in bytes."""
+    rss = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    peak = None
+    try:
+        import resource
+        # kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == "darwin" else 1024
+    except ImportError:
+        pass
+    return {"pid": os.getpid(), "rss_bytes": rss, "peak_rss_bytes": peak}
+
+
+class MemoryTracker:
+    def __init__(self, max_snapshots: int = 5):
+        self.max_snapshots = max_snapshots
+        self._components: Dict[str, Callable[[], Any]] = {}
+        self._snapshots: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, name: str, get: Callable[[], Any]):
+        """Report the deep size of ``get()`` as component ``name``."""
+        self._components[name] = get
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start_tracing(self, frames: int = 1):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop_tracing(self):
+        """Stop tracing; snapshots taken so far are kept for diffs."""
+        tracemalloc.stop()
+
+    def snapshot(self, label: Optional[str] = None) -> str:
+        """Store a tracemalloc snapshot under ``label``, dropping the oldest beyond ``max_snapshots``."""
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing")
+        taken_at = datetime.now(timezone.utc)
+        label = label or taken_at.strftime("%Y%m%dT%H%M%S")
+        snapshot = self._take()
+        traced = sum(trace.size for trace in snapshot.traces)
+        with self._lock:
+            self._snapshots.pop(label, None)
+            self._snapshots[label] = (taken_at, snapshot, traced)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return label
+
+    def snapshots(self) -> list:
+        with self._lock:
+            return [
+                {"label": label, "taken_at": taken_at, "traced_bytes": traced}
+                for label, (taken_at, _, traced) in self._snapshots.items()
+            ]
+
+    def top(self, limit: int = 20, group_by: str = "lineno") -> list:
+        if not tracemalloc.is_tracing():
+            return []
+        return [self._stat(stat, group_by) for stat in self._take().statistics(group_by)[:limit]]
+
+    def diff(self, since: str, until: Optional[str] = None, limit: int = 20, group_by: str = "lineno") -> list:
+        """Largest allocation changes from snapshot ``since`` to ``until`` (or now)."""
+        with self._lock:
+            if since not in self._snapshots or (until is not None and until not in self._snapshots):
+                raise KeyError(until if since in self._snapshots else since)
+            old = self._snapshots[since][1]
+            new = self._snapshots[until][1] if until is not None else None
+        if new is None:
+            if not tracemalloc.is_tracing():
+                raise RuntimeError("tracemalloc is not tracing")
+            new = self._take()
+        return [
+            dict(self._stat(stat, group_by), size_diff_bytes=stat.size_diff, count_diff=stat.count_diff)
+            for stat in new.compare_to(old, group_by)[:limit]
+        ]
+
+    def component_sizes(self) -> dict:
+        sizes = {}
+        for name, get in self._components.items():
+            try:
+                sizes[name] = deep_sizeof(get())
+            except Exception as e:
+                sizes[name] = {"error": str(e)}
+        return sizes
+
+    def report(self, limit: int = 20, group_by: str = "lineno", sizes: bool = True, types: bool = False) -> dict:
+        report = {
+            "process": process_memory(),
+            "gc": {
+                "counts": gc.get_count(),
+                "thresholds": gc.get_threshold(),
+                "uncollectable": len(gc.garbage),
+            },
+            "tracemalloc": self.stats(),
+        }
+        if tracemalloc.is_tracing():
+            report["top_allocators"] = self.top(limit, group_by)
+        if sizes:
+            report["components"] = self.component_sizes()
+        if types:
+            counts = Counter(type(obj).__name__ for obj in gc.get_objects())
+            report["gc"]["tracked_objects"] = sum(counts.values())
+            report["gc"]["top_types"] = counts.most_common(limit)
+        return report
+
+    def stats(self) -> dict:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else None,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "overhead_bytes": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            "snapshots": list(self._snapshots),
+        }
+
+    def _take(self):
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in IGNORED_FILES]
+        )
+
+    @staticmethod
+    def _stat(stat, group_by: str) -> dict:
+        frame = stat.traceback[0]
+        location = frame.filename if group_by == "filename" else f"{frame.filename}:{frame.lineno}"
+        entry = {"location": location, "size_bytes": stat.size, "count": stat.count}
+        if group_by == "traceback":
+            entry["traceback"] = [f"{f.filename}:{f.lineno}" for f in stat.traceback]
+        return entry
@@ -0,0 +1,138 @@
+# backend/metrics.py
+"""Request and per-stage latency histograms in Prometheus text format.
+
+The HTTP middleware opens a ``RequestTimings`` for each request; code on
+the request path wraps its expensive steps in ``stage("name")``. Stage
+durations are kept on the request (for the ``Server-Timing`` header) and,
+when the request finishes, folded into histograms labelled with the route
+template. The context variable is copied into ``asyncio.to_thread`` and
+CPU-pool workers, so stages inside them are attributed to their request.
+"""
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# stages that run outside any request, e.g. the scheduled feed pre-warm
+BACKGROUND = "background"
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values."""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets=BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: Dict[tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # per-bucket counts, then +Inf count and sum
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            series[bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.label_names, labels))
+            sep = "," if base else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound}"}} {cumulative:g}')
+            cumulative += series[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {cumulative:g}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative:g}")
+        return lines
+
+
+class RequestTimings:
+    """Stage durations collected while one request is served."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage_name: str, seconds: float):
+        with self._lock:
+            self._stages[stage_name] = self._stages.get(stage_name, 0.0) + seconds
+
+    def stages(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._stages)
+
+    def server_timing(self, total: float) -> str:
+        parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages().items()]
+        parts.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_current: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar("request_timings", default=None)
+
+
+class Metrics:
+    def __init__(self):
+        self.requests = Histogram(
+            "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route", "status")
+        )
+        self.stages = Histogram(
+            "http_request_stage_duration_seconds", "Time spent in each stage of a request.", ("route", "stage")
+        )
+        self._gauges: List[Tuple[str, str, Callable[[], float]]] = []
+
+    def gauge(self, name: str, help_text: str, read: Callable[[], float]):
+        """Register a value read at scrape time."""
+        self._gauges.append((name, help_text, read))
+
+    def start_request(self) -> Tuple[RequestTimings, contextvars.Token]:
+        timings = RequestTimings()
+        return timings, _current.set(timings)
+
+    def finish_request(self, timings: RequestTimings, token: contextvars.Token,
+                       method: str, route: str, status: int) -> float:
+        _current.reset(token)
+        total = time.perf_counter() - timings.started
+        self.requests.observe((method, route, str(status)), total)
+        for stage_name, seconds in timings.stages().items():
+            self.stages.observe((route, stage_name), seconds)
+        return total
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            timings = _current.get()
+            if timings is not None:
+                timings.add(name, elapsed)
+            else:
+                self.stages.observe((BACKGROUND, name), elapsed)
+
+    def render(self) -> str:
+        lines = self.requests.render() + self.stages.render()
+        for name, help_text, read in self._gauges:
+            try:
+                value = float(read())
+            except Exception:
+                continue
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value:g}"]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,17 @@
+# backend/mongo_utils.py
+"""Helpers for storing arbitrary strings as MongoDB field names."""
+
+
+def escape_key(key: str) -> str:
+    """Make a key safe to use as a segment of a dotted update path."""
+    key = key.replace(".", "．")
+    if key.startswith("$"):
+        key = "＄" + key[1:]
+    return key
+
+
+def unescape_key(key: str) -> str:
+    key = key.replace("．", ".")
+    if key.startswith("＄"):
+        key = "$" + key[1:]
+    return key
@@ -0,0 +1,165 @@
+# backend/newsapi_client.py
+"""Thin client for the NewsAPI endpoints used by the backend.
+
+Callers on a request path wrap their work in ``deadline(seconds)``; every
+upstream call made inside it (including from ``asyncio.to_thread`` and the
+CPU pool, which copy the context) shares that budget, so a request that
+falls back from one upstream call to another cannot exceed it.
+``call_priority(BACKGROUND)`` likewise marks every call made inside it as
+background work for the quota.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+import requests
+
+from circuit_breaker import CircuitBreaker
+from quota import INTERACTIVE, QuotaManager
+
+DEFAULT_BASE_URL = "https://newsapi.org/v2"
+
+
+class NewsAPIError(Exception):
+    """Raised when NewsAPI answers with an error payload."""
+
+
+class QuotaExceeded(NewsAPIError):
+    """Raised instead of calling upstream when the request budget is exhausted."""
+
+
+class UpstreamUnavailable(NewsAPIError):
+    """Raised when NewsAPI timed out, was unreachable or answered with a server error."""
+
+
+class CircuitOpen(UpstreamUnavailable):
+    """Raised instead of calling upstream while the circuit breaker is open."""
+
+
+class DeadlineExceeded(UpstreamUnavailable):
+    """Raised instead of calling upstream when the caller's deadline leaves no time."""
+
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("newsapi_deadline", default=None)
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("newsapi_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def deadline(seconds: float):
+    """Bound the upstream calls made inside the block to ``seconds`` in total."""
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def call_priority(priority: str):
+    """Spend quota at ``priority`` for calls inside the block that don't pass one."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class DeadlineMiddleware:
+    """ASGI middleware giving each HTTP request one upstream ``deadline``.
+
+    A plain pass-through when ``seconds`` is not positive.
+    """
+
+    def __init__(self, app, seconds: float):
+        self.app = app
+        self.seconds = seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.seconds <= 0:
+            await self.app(scope, receive, send)
+            return
+        with deadline(self.seconds):
+            await self.app(scope, receive, send)
+
+
+class NewsAPIClient:
+    def __init__(self, api_key: str, base_url: str = DEFAULT_BASE_URL, timeout: float = 10.0,
+                 quota: Optional[QuotaManager] = None, breaker: Optional[CircuitBreaker] = None,
+                 min_timeout: float = 0.25):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.quota = quota
+        self.breaker = breaker
+        # below this much remaining deadline a call is not worth starting
+        self.min_timeout = min_timeout
+
+    def get(self, path: str, params: dict, priority: Optional[str] = None) -> dict:
+        priority = priority or _priority.get()
+        timeout = self.timeout
+        at = _deadline.get()
+        if at is not None:
+            timeout = min(timeout, at - time.monotonic())
+            if timeout < self.min_timeout:
+                raise DeadlineExceeded("No time left for a NewsAPI call")
+        if self.breaker is not None and not self.breaker.allow():
+            raise CircuitOpen("NewsAPI circuit is open")
+        if self.quota is not None and not self.quota.try_acquire(priority):
+            raise QuotaExceeded(f"NewsAPI budget exhausted for {priority} requests")
+        params = {k: v for k, v in params.items() if v not in (None, "")}
+        params["apiKey"] = self.api_key
+        try:
+            response = requests.get(f"{self.base_url}/{path}", params=params, timeout=timeout)
+        except requests.Timeout as e:
+            if timeout < self.timeout:
+                # the caller's deadline ran out, which says nothing about upstream health
+                raise DeadlineExceeded(f"NewsAPI call exceeded the request deadline: {e}") from e
+            self._record(False)
+            raise UpstreamUnavailable(f"NewsAPI timed out: {e}") from e
+        except requests.ConnectionError as e:
+            self._record(False)
+            raise UpstreamUnavailable(f"NewsAPI unreachable: {e}") from e
+        if response.status_code >= 500:
+            self._record(False)
+            raise UpstreamUnavailable(f"NewsAPI answered {response.status_code}")
+        # anything else, including 4xx, means upstream is up
+        self._record(True)
+        if response.status_code == 429:
+            if self.quota is not None:
+                retry_after = response.headers.get("Retry-After")
+                self.quota.note_rate_limited(float(retry_after) if retry_after and retry_after.isdigit() else None)
+            # callers treat this like an exhausted budget and fall back to local articles
+            raise QuotaExceeded("NewsAPI rate limit reached")
+        response.raise_for_status()
+        data = response.json()
+        if not isinstance(data, dict):
+            raise NewsAPIError("Invalid response format from news API")
+        if data.get("status") != "ok":
+            raise NewsAPIError(data.get("message", "Unknown error"))
+        return data
+
+    def top_headlines(
+        self,
+        category: Optional[str] = None,
+        country: Optional[str] = None,
+        q: Optional[str] = None,
+        page_size: Optional[int] = None,
+        priority: Optional[str] = None,
+    ) -> List[dict]:
+        data = self.get(
+            "top-headlines",
+            {"category": category, "country": country, "q": q, "pageSize": page_size},
+            priority=priority,
+        )
+        articles = data.get("articles", [])
+        return articles if isinstance(articles, list) else []
+
+    def _record(self, ok: bool):
+        if self.breaker is not None:
+            if ok:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
@@ -0,0 +1,55 @@
+# backend/pagination.py
+"""Opaque keyset cursors for paginated listings."""
+import base64
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+
+
+def encode_cursor(values: dict) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, fields: Optional[Dict[str, type]] = None) -> dict:
+    """Decode a cursor produced by ``encode_cursor``; raises ``ValueError`` if malformed.
+
+    ``fields`` maps each key the cursor must carry to its expected type.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = orjson.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, dict):
+        raise ValueError("Invalid cursor")
+    for name, expected in (fields or {}).items():
+        if not isinstance(values.get(name), expected):
+            raise ValueError("Invalid cursor")
+    return values
+
+
+def page_after(
+    items: Sequence[dict],
+    sort_key: Callable[[dict], tuple],
+    cursor: Optional[str],
+    page_size: int,
+) -> Tuple[List[dict], Optional[str]]:
+    """Page an already-ranked list (descending by ``sort_key``) by keyset.
+
+    The cursor stores the sort key of the last item served, so the next page
+    starts strictly after it even if the underlying list was re-ranked.
+    """
+    start = 0
+    if cursor:
+        last = tuple(decode_cursor(cursor, {"k": list})["k"])
+        try:
+            while start < len(items) and tuple(sort_key(items[start])) >= last:
+                start += 1
+        except TypeError as e:
+            # key values of the wrong types for this listing
+            raise ValueError("Invalid cursor") from e
+    page = list(items[start:start + page_size])
+    next_cursor = None
+    if page and start + page_size < len(items):
+        next_cursor = encode_cursor({"k": list(sort_key(page[-1]))})
+    return page, next_cursor
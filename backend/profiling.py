@@ -0,0 +1,216 @@
+# backend/profiling.py
+"""Opt-in profiling of individual requests.
+
+A request is profiled when an admin asks for it with the ``X-Profile``
+header, or when it falls into ``sample_rate``. ``ProfilingMiddleware`` is
+plain ASGI: with sampling off, an unprofiled request costs one header scan
+and is passed straight through.
+
+Two modes are available:
+- ``sampler`` (the default) samples the stacks of every thread at a fixed
+  interval. It writes collapsed stacks (``.folded``), which flamegraph.pl,
+  speedscope and inferno can all read. It follows work handed to
+  ``asyncio.to_thread`` and the CPU pool, but it also sees any other
+  requests running at the same time.
+- ``cprofile`` writes a ``.prof`` file for snakeviz or flameprof. It only
+  covers the event-loop thread.
+
+Only one request is profiled at a time; other requests run unprofiled in
+the meantime.
+"""
+import cProfile
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+from starlette.responses import JSONResponse
+
+MODES = ("sampler", "cprofile")
+# leaf frames of threads that are parked rather than working
+IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+}
+
+
+class StackSampler:
+    """Counts collapsed stacks of all other threads every ``interval`` seconds."""
+
+    def __init__(self, interval: float = 0.005, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.counts
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                code = frame.f_code
+                if not self.include_idle and (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.counts[";".join(reversed(stack))] += 1
+
+
+class ProfileSession:
+    def __init__(self, mode: str, interval: float):
+        self.mode = mode
+        self.started = time.perf_counter()
+        if mode == "cprofile":
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        else:
+            self.profiler = StackSampler(interval)
+            self.profiler.start()
+
+
+class RequestProfiler:
+    def __init__(self, output_dir: str, sample_rate: float = 0.0, mode: str = "sampler", interval: float = 0.005):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode '{mode}'")
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.interval = interval
+        self._busy = threading.Lock()
+        self.captured = 0
+        self.skipped_busy = 0
+        self.last_file: Optional[str] = None
+
+    def start(self, requested_mode: Optional[str] = None) -> Optional[ProfileSession]:
+        """Begin profiling if requested or sampled; ``None`` means run unprofiled."""
+        if requested_mode is None and not (self.sample_rate and random.random() < self.sample_rate):
+            return None
+        if not self._busy.acquire(blocking=False):
+            self.skipped_busy += 1
+            return None
+        try:
+            mode = requested_mode if requested_mode in MODES else self.mode
+            return ProfileSession(mode, self.interval)
+        except Exception:
+            self._busy.release()
+            raise
+
+    def finish(self, session: ProfileSession, label: str) -> Optional[str]:
+        """Stop ``session`` and write its output; returns the file path."""
+        elapsed = time.perf_counter() - session.started
+        try:
+            if session.mode == "cprofile":
+                session.profiler.disable()
+            else:
+                counts = session.profiler.stop()
+            os.makedirs(self.output_dir, exist_ok=True)
+            slug = re.sub(r"[^A-Za-z0-9]+", "_", label).strip("_")[:80]
+            base = os.path.join(self.output_dir, f"{datetime.now():%Y%m%d-%H%M%S-%f}-{slug}-{elapsed * 1000:.0f}ms")
+            if session.mode == "cprofile":
+                path = base + ".prof"
+                session.profiler.dump_stats(path)
+            else:
+                path = base + ".folded"
+                with open(path, "w") as f:
+                    for stack, count in counts.most_common():
+                        f.write(f"{stack} {count}\n")
+            self.captured += 1
+            self.last_file = path
+            return path
+        except OSError as e:
+            print(f"Could not write profile for {label}: {e}")
+            return None
+        finally:
+            self._busy.release()
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "sample_rate": self.sample_rate,
+            "output_dir": self.output_dir,
+            "captured": self.captured,
+            "skipped_busy": self.skipped_busy,
+            "last_file": self.last_file,
+        }
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles requests for ``RequestProfiler``.
+
+    ``X-Profile: 1`` (or a mode name) together with ``X-Admin-Token`` asks
+    for a profile; the file name comes back in ``X-Profile-File``. The
+    profile covers the request until the response starts.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler, admin_token: str = ""):
+        self.app = app
+        self.profiler = profiler
+        self.admin_token = admin_token
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        requested = admin = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                requested = value.decode("latin-1")
+            elif name == b"x-admin-token":
+                admin = value.decode("latin-1")
+        if requested:
+            if not self.admin_token or admin != self.admin_token:
+                response = JSONResponse({"detail": "Profiling requires the admin token"}, status_code=403)
+                await response(scope, receive, send)
+                return
+            requested = requested.lower()
+        else:
+            requested = None
+        session = self.profiler.start(requested)
+        if session is None:
+            await self.app(scope, receive, send)
+            return
+
+        label = f"{scope['method']} {scope['path']}"
+        finished = False
+
+        async def send_with_profile(message):
+            nonlocal finished
+            if message["type"] == "http.response.start" and not finished:
+                finished = True
+                path = self.profiler.finish(session, label)
+                if path:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-profile-file", os.path.basename(path).encode("latin-1")))
+                    message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            if not finished:
+                finished = True
+                self.profiler.finish(session, label)
@@ -0,0 +1,172 @@
+# backend/quota.py
+"""Token-bucket budget for NewsAPI calls with priority for interactive traffic."""
+import threading
+import time
+from typing import Optional
+
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+
+class QuotaManager:
+    """Shared NewsAPI budget.
+
+    Tokens refill continuously at ``refill_per_second`` up to ``capacity``.
+    Background work (scheduled sweeps) may only spend tokens above the
+    ``background_reserve`` fraction of capacity, so interactive requests keep
+    the last part of the bucket. A 429 from upstream empties the bucket and
+    blocks all calls for the cooldown period.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float, background_reserve: float = 0.5):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.background_reserve = background_reserve
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.granted = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.denied = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.rate_limited = 0
+
+    def _cooldown(self, retry_after: Optional[float]) -> float:
+        cooldown = retry_after if retry_after else 1 / self.refill_per_second if self.refill_per_second else 60.0
+        return min(cooldown, 3600.0)
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    def try_acquire(self, priority: str = INTERACTIVE) -> bool:
+        """Take one token if the budget allows a call at this priority."""
+        now = time.monotonic()
+        with self._lock:
+            self._refill(now)
+            floor = self.capacity * self.background_reserve if priority == BACKGROUND else 0.0
+            if now < self._blocked_until or self._tokens - 1 < floor:
+                self.denied[priority] += 1
+                return False
+            self._tokens -= 1
+            self.granted[priority] += 1
+            return True
+
+    def note_rate_limited(self, retry_after: Optional[float] = None):
+        """Upstream answered 429: stop spending until it is likely to recover."""
+        with self._lock:
+            self.rate_limited += 1
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+            self._blocked_until = self._updated + self._cooldown(retry_after)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "remaining": round(self._tokens, 2),
+                "capacity": self.capacity,
+                "refill_per_second": self.refill_per_second,
+                "blocked_for_seconds": round(max(0.0, self._blocked_until - time.monotonic()), 1),
+                "granted": dict(self.granted),
+                "denied": dict(self.denied),
+                "rate_limited": self.rate_limited,
+            }
+
+
+class SharedQuotaManager(QuotaManager):
+    """QuotaManager whose bucket is one Mongo document shared by every worker.
+
+    Each call reads the bucket, refills it from the wall clock and writes it
+    back only if nobody else changed it in between (compare-and-swap on
+    ``version``), so all processes spend a single account-wide budget and
+    the scheduling leader can use all of the background share. NewsAPI
+    calls are rare, so the extra round trip is cheap and conflicts are
+    retried. While Mongo is unreachable each process falls back to its own
+    in-memory bucket holding ``1 / fallback_workers`` of the budget.
+    """
+
+    def __init__(self, collection, capacity: float, refill_per_second: float, background_reserve: float = 0.5,
+                 name: str = "newsapi", fallback_workers: int = 1, max_attempts: int = 5):
+        super().__init__(
+            max(1.0, capacity / fallback_workers), refill_per_second / fallback_workers, background_reserve
+        )
+        self.collection = collection
+        self.name = name
+        self.max_attempts = max_attempts
+        self.shared_capacity = capacity
+        self.shared_refill_per_second = refill_per_second
+        self.fallbacks = 0
+
+    def _tokens_at(self, doc: Optional[dict], now: float) -> float:
+        if doc is None:
+            return self.shared_capacity
+        elapsed = max(0.0, now - doc["updated"])
+        return min(self.shared_capacity, doc["tokens"] + elapsed * self.shared_refill_per_second)
+
+    def try_acquire(self, priority: str = INTERACTIVE) -> bool:
+        try:
+            for _ in range(self.max_attempts):
+                now = time.time()
+                doc = self.collection.find_one({"_id": self.name})
+                tokens = self._tokens_at(doc, now)
+                floor = self.shared_capacity * self.background_reserve if priority == BACKGROUND else 0.0
+                if now < (doc or {}).get("blocked_until", 0.0) or tokens - 1 < floor:
+                    break
+                if self._swap(doc, {"tokens": tokens - 1, "updated": now}):
+                    with self._lock:
+                        self.granted[priority] += 1
+                    return True
+        except PyMongoError as e:
+            print(f"Shared NewsAPI quota unavailable, using this worker's share: {e}")
+            self.fallbacks += 1
+            return super().try_acquire(priority)
+        # denied, or lost every race for the bucket
+        with self._lock:
+            self.denied[priority] += 1
+        return False
+
+    def _swap(self, doc: Optional[dict], values: dict) -> bool:
+        if doc is None:
+            try:
+                self.collection.insert_one(dict(values, _id=self.name, blocked_until=0.0, version=1))
+                return True
+            except DuplicateKeyError:
+                return False
+        result = self.collection.update_one(
+            {"_id": self.name, "version": doc["version"]}, {"$set": values, "$inc": {"version": 1}}
+        )
+        return result.matched_count == 1
+
+    def note_rate_limited(self, retry_after: Optional[float] = None):
+        super().note_rate_limited(retry_after)
+        now = time.time()
+        try:
+            self.collection.update_one(
+                {"_id": self.name},
+                {
+                    "$set": {"tokens": 0.0, "updated": now, "blocked_until": now + self._cooldown(retry_after)},
+                    "$inc": {"version": 1},
+                },
+                upsert=True,
+            )
+        except PyMongoError as e:
+            print(f"Could not share NewsAPI rate limit: {e}")
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        try:
+            doc = self.collection.find_one({"_id": self.name})
+        except PyMongoError:
+            return dict(stats, shared=False, fallbacks=self.fallbacks)
+        now = time.time()
+        return dict(
+            stats,
+            shared=True,
+            remaining=round(self._tokens_at(doc, now), 2),
+            capacity=self.shared_capacity,
+            refill_per_second=self.shared_refill_per_second,
+            blocked_for_seconds=round(max(0.0, (doc or {}).get("blocked_until", 0.0) - now), 1),
+            fallbacks=self.fallbacks,
+        )
@@ -0,0 +1,137 @@
+# backend/retention.py
+"""Bounded retention for the ``news`` collection.
+
+Unpinned articles carry an ``expire_at`` date and a TTL index removes them
+after it passes. Before that, the daily ``compact`` job moves articles
+older than the retention period into gzip-compressed JSON-lines archive
+files and deletes them. The TTL index is only a backstop in case
+compaction isn't running. Articles on any user's saved or liked list are
+pinned: they have no ``expire_at`` and compaction skips them.
+"""
+import gzip
+import os
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+import orjson
+from pymongo import ASCENDING
+
+# safety margin between the end of retention and the TTL backstop
+TTL_GRACE_DAYS = 2
+
+
+class ArticleRetention:
+    def __init__(
+        self,
+        news_collection,
+        lists_collection,
+        archive_dir: str,
+        retention_days: int = 7,
+        batch_size: int = 1000,
+    ):
+        self.news_collection = news_collection
+        self.lists_collection = lists_collection
+        self.archive_dir = archive_dir
+        self.retention = timedelta(days=retention_days)
+        self.batch_size = batch_size
+        self.on_remove: List[Callable[[List[str]], None]] = []
+        self.archived = 0
+        self.last_compaction: Optional[dict] = None
+
+    @property
+    def ttl(self) -> timedelta:
+        """How long after ``created_at`` an unpinned article's TTL fires."""
+        return self.retention + timedelta(days=TTL_GRACE_DAYS)
+
+    def ensure_indexes(self):
+        self.news_collection.create_index("expire_at", expireAfterSeconds=0)
+        self.news_collection.create_index([("pinned", ASCENDING), ("created_at", ASCENDING)])
+        # articles stored before retention existed get a full period from now
+        self.news_collection.update_many(
+            {"pinned": {"$exists": False}},
+            {"$set": {"pinned": False, "expire_at": datetime.now() + self.ttl}},
+        )
+
+    def pin(self, article_id: str):
+        self.news_collection.update_one(
+            {"article_id": article_id},
+            {"$set": {"pinned": True}, "$unset": {"expire_at": ""}},
+        )
+
+    def pin_many(self, article_ids: List[str]):
+        if article_ids:
+            self.news_collection.update_many(
+                {"article_id": {"$in": list(article_ids)}},
+                {"$set": {"pinned": True}, "$unset": {"expire_at": ""}},
+            )
+
+    def release_many(self, article_ids: List[str]):
+        """Unpin the articles that no user list references any more."""
+        article_ids = list(article_ids)
+        if not article_ids:
+            return
+        referenced = set(self.lists_collection.distinct("article_id", {"article_id": {"$in": article_ids}}))
+        free = [article_id for article_id in article_ids if article_id not in referenced]
+        if free:
+            # give them at least one more grace period before the TTL can fire
+            self.news_collection.update_many(
+                {"article_id": {"$in": free}, "pinned": True},
+                {"$set": {"pinned": False, "expire_at": datetime.now() + timedelta(days=TTL_GRACE_DAYS)}},
+            )
+
+    def compact(self) -> int:
+        """Archive and delete unpinned articles past retention; returns the count."""
+        cutoff = datetime.now() - self.retention
+        path = os.path.join(self.archive_dir, f"articles-{datetime.now():%Y%m%d-%H%M%S}.jsonl.gz")
+        archived = 0
+        out = None
+        try:
+            while True:
+                batch = list(
+                    self.news_collection.find({"pinned": False, "created_at": {"$lt": cutoff}}, {"_id": 0})
+                    .sort("created_at", ASCENDING)
+                    .limit(self.batch_size)
+                )
+                if not batch:
+                    break
+                ids = [doc["article_id"] for doc in batch]
+                referenced = set(self.lists_collection.distinct("article_id", {"article_id": {"$in": ids}}))
+                for article_id in referenced:
+                    # saved before pinning existed, or pinned concurrently
+                    self.pin(article_id)
+                batch = [doc for doc in batch if doc["article_id"] not in referenced]
+                if not batch:
+                    continue
+                if out is None:
+                    os.makedirs(self.archive_dir, exist_ok=True)
+                    out = gzip.open(path, "wb")
+                for doc in batch:
+                    out.write(orjson.dumps(doc, default=str) + b"\n")
+                # the batch is only deleted once it is safely in the archive
+                out.flush()
+                ids = [doc["article_id"] for doc in batch]
+                self.news_collection.delete_many({"article_id": {"$in": ids}, "pinned": False})
+                archived += len(ids)
+                self._notify(ids)
+        finally:
+            if out is not None:
+                out.close()
+        self.archived += archived
+        self.last_compaction = {"at": datetime.now().isoformat(), "archived": archived, "file": path if archived else None}
+        return archived
+
+    def _notify(self, article_ids: List[str]):
+        for callback in self.on_remove:
+            try:
+                callback(article_ids)
+            except Exception as e:
+                print(f"Retention callback failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "retention_days": self.retention.days,
+            "archive_dir": self.archive_dir,
+            "archived": self.archived,
+            "last_compaction": self.last_compaction,
+        }
+
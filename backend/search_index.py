@@ -0,0 +1,158 @@
+# backend/search_index.py
+"""In-process BM25 full-text index over the local article corpus."""
+import heapq
+import math
+import threading
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from ai_model import tokenize
+
+INDEX_FIELDS = {
+    "_id": 0, "article_id": 1, "title": 1, "description": 1, "category": 1, "categories": 1, "source": 1,
+    "publishedAt": 1,
+}
+
+
+class BM25Index:
+    """Okapi BM25 over article titles and descriptions, updated incrementally."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._doc_len: List[int] = []
+        # (article_id, categories, source, publishedAt); removed documents
+        # leave ``None`` here until the ids are renumbered
+        self._meta: List[Optional[Tuple[str, FrozenSet[str], str, str]]] = []
+        self._ids: Dict[str, int] = {}
+        self._total_len = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, article: dict) -> bool:
+        """Index ``article``; returns False if it was already indexed.
+
+        Re-adding an indexed article only refreshes its categories, which
+        grow as ingestion sees it under more of them.
+        """
+        article_id = article.get("article_id")
+        if not article_id:
+            return False
+        categories = frozenset(article.get("categories") or [article.get("category") or ""])
+        with self._lock:
+            doc = self._ids.get(article_id)
+            if doc is not None:
+                self._meta[doc] = (article_id, categories) + self._meta[doc][2:]
+                return False
+        terms = tokenize(f"{article.get('title') or ''} {article.get('description') or ''}")
+        with self._lock:
+            if article_id in self._ids:
+                return False
+            doc = len(self._doc_len)
+            self._ids[article_id] = doc
+            self._doc_len.append(len(terms))
+            self._meta.append((
+                article_id,
+                categories,
+                article.get("source") or "",
+                article.get("publishedAt") or "",
+            ))
+            self._total_len += len(terms)
+            for term, tf in Counter(terms).items():
+                self._postings.setdefault(term, {})[doc] = tf
+        return True
+
+    def add_many(self, articles: List[dict]):
+        for article in articles:
+            self.add(article)
+
+    def remove_many(self, article_ids: Iterable[str]) -> int:
+        """Drop articles from the index; returns how many were indexed."""
+        with self._lock:
+            docs = {self._ids.pop(aid) for aid in article_ids if aid in self._ids}
+            if not docs:
+                return 0
+            for doc in docs:
+                self._total_len -= self._doc_len[doc]
+                self._doc_len[doc] = 0
+                self._meta[doc] = None
+            for term in list(self._postings):
+                postings = self._postings[term]
+                for doc in docs & postings.keys():
+                    del postings[doc]
+                if not postings:
+                    del self._postings[term]
+            if len(self._meta) > 2 * len(self._ids):
+                self._renumber()
+            return len(docs)
+
+    def prune(self, keep_ids: Iterable[str]) -> int:
+        """Drop every indexed article whose id is not in ``keep_ids``."""
+        keep = set(keep_ids)
+        with self._lock:
+            stale = [aid for aid in self._ids if aid not in keep]
+        return self.remove_many(stale)
+
+    def _renumber(self):
+        order = sorted(self._ids.values())
+        mapping = {old: new for new, old in enumerate(order)}
+        self._doc_len = [self._doc_len[old] for old in order]
+        self._meta = [self._meta[old] for old in order]
+        self._ids = {aid: mapping[doc] for aid, doc in self._ids.items()}
+        self._postings = {
+            term: {mapping[doc]: tf for doc, tf in postings.items()}
+            for term, postings in self._postings.items()
+        }
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> Tuple[int, List[Tuple[str, float]]]:
+        """Return the total hit count and one page of ``(article_id, score)`` pairs.
+
+        Dates compare against ISO ``publishedAt`` strings, so ``YYYY-MM-DD``
+        prefixes work as inclusive day bounds.
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            n_docs = len(self._ids)
+            if not terms or not n_docs:
+                return 0, []
+            avg_len = self._total_len / n_docs
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc] / avg_len)
+                    scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            hits = []
+            for doc, score in scores.items():
+                article_id, doc_categories, doc_source, published = self._meta[doc]
+                if category and category not in doc_categories:
+                    continue
+                if source and doc_source != source:
+                    continue
+                if from_date and published < from_date:
+                    continue
+                if to_date and published[:len(to_date)] > to_date:
+                    continue
+                hits.append((score, published, article_id))
+
+        page = heapq.nlargest(offset + limit, hits)[offset:]
+        return len(hits), [(article_id, round(score, 4)) for score, _, article_id in page]
+
+    def stats(self) -> dict:
+        return {"documents": len(self._ids), "terms": len(self._postings)}
@@ -0,0 +1,75 @@
+# backend/suggest.py
+"""Frequency-weighted prefix autocomplete for search keywords."""
+import heapq
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Iterable, List, Tuple
+
+from ai_model import STOP_WORDS, WORD_RE
+
+MIN_TERM_LENGTH = 3
+MAX_SUGGESTIONS = 20
+
+
+class PrefixSuggester:
+    """Autocomplete over a sorted term array, rebuilt periodically from raw counts.
+
+    Writers only touch ``_counts``; ``rebuild`` publishes an immutable
+    ``(terms, weights)`` snapshot that readers use without locking. Memory
+    is capped at ``max_terms`` published terms, and raw counts are pruned
+    back to that size whenever they grow past twice the cap.
+    """
+
+    def __init__(self, max_terms: int = 50000, short_prefix_cache: int = 2):
+        self.max_terms = max_terms
+        self.short_prefix_cache = short_prefix_cache
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._snapshot: Tuple[List[str], List[float], dict] = ([], [], {})
+
+    def add_text(self, text: str, weight: float = 1.0):
+        words = [
+            w for w in WORD_RE.findall((text or "").lower())
+            if len(w) >= MIN_TERM_LENGTH and w not in STOP_WORDS and not w.isdigit()
+        ]
+        if not words:
+            return
+        with self._lock:
+            for word in words:
+                self._counts[word] += weight
+            if len(self._counts) > 2 * self.max_terms:
+                self._counts = Counter(dict(self._counts.most_common(self.max_terms)))
+
+    def add_articles(self, articles: Iterable[dict]):
+        for article in articles:
+            self.add_text(article.get("title") or "")
+
+    def rebuild(self):
+        with self._lock:
+            top = self._counts.most_common(self.max_terms)
+        top.sort()
+        terms = [term for term, _ in top]
+        weights = [weight for _, weight in top]
+        self._snapshot = (terms, weights, {})
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[str]:
+        prefix = (prefix or "").strip().lower()
+        if not prefix:
+            return []
+        terms, weights, cache = self._snapshot
+        cached = cache.get(prefix)
+        if cached is not None:
+            return cached[:limit]
+
+        lo = bisect_left(terms, prefix)
+        hi = bisect_left(terms, prefix + "\uffff", lo)
+        best = heapq.nlargest(MAX_SUGGESTIONS, range(lo, hi), key=weights.__getitem__)
+        result = [terms[i] for i in best]
+        if len(prefix) <= self.short_prefix_cache:
+            # short prefixes match large ranges, so remember them per snapshot
+            cache[prefix] = result
+        return result[:limit]
+
+    def stats(self) -> dict:
+        return {"terms": len(self._snapshot[0]), "raw_terms": len(self._counts), "max_terms": self.max_terms}
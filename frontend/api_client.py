@@ -39,9 +39,38 @@ class APIClient:
         )
         return response
 
-    def fetch_news(self, categories, keywords="", locations=None, limit=40):
+    def fetch_news(self, categories, keywords="", locations=None, limit=40, cursor=None):
         response = requests.post(
             f"{self.base_url}/news/fetch",
+            json={"categories": categories, "keywords": keywords, "locations": locations, "limit": limit,
+                  "cursor": cursor},
+            headers=self.get_headers()
+        )
+        return response
+
+    def search_news(self, query, category=None, source=None, page=1, page_size=20):
+        params = {"q": query, "page": page, "page_size": page_size}
+        if category:
+            params["category"] = category
+        if source:
+            params["source"] = source
+        response = requests.get(
+            f"{self.base_url}/news/search",
+            params=params,
+            headers=self.get_headers()
+        )
+        return response
+
+    def suggest_keywords(self, prefix, limit=10):
+        response = requests.get(
+            f"{self.base_url}/news/suggest",
+            params={"prefix": prefix, "limit": limit}
+        )
+        return response
+
+    def get_feed(self, categories, keywords="", locations=None, limit=40):
+        response = requests.post(
+            f"{self.base_url}/feed",
             json={"categories": categories, "keywords": keywords, "locations": locations, "limit": limit},
             headers=self.get_headers()
         )
@@ -93,27 +122,42 @@ class APIClient:
         )
         return response
 
-    def get_saved_articles(self):
+    def get_saved_articles(self, cursor=None, page_size=50):
         response = requests.get(
             f"{self.base_url}/user/saved-articles",
+            params=_page_params(cursor, page_size),
             headers=self.get_headers()
         )
         return response
 
-    def get_liked_articles(self):
+    def get_liked_articles(self, cursor=None, page_size=50):
         response = requests.get(
             f"{self.base_url}/user/liked-articles",
+            params=_page_params(cursor, page_size),
             headers=self.get_headers()
         )
         return response
 
-    def get_personalized_news(self):
+    def get_personalized_news(self, cursor=None, page_size=20):
         response = requests.get(
             f"{self.base_url}/news/personalized",
+            params=_page_params(cursor, page_size),
             headers=self.get_headers()
         )
         return response
 
+    def stream_personalized_news(self):
+        """Yield personalized feed events as the backend scores each category."""
+        with requests.get(
+            f"{self.base_url}/news/personalized/stream",
+            headers=self.get_headers(),
+            stream=True
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
     def get_explore_news(self, limit=10):
         response = requests.get(
             f"{self.base_url}/news/explore?limit={limit}",
@@ -122,6 +166,13 @@ class APIClient:
         return response
 
 
+def _page_params(cursor, page_size):
+    params = {"page_size": page_size}
+    if cursor:
+        params["cursor"] = cursor
+    return params
+
+
 def format_error_detail(error_data, default_msg):
     """Normalize error details from the backend."""
     detail = error_data.get("detail", default_msg)
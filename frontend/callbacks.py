@@ -17,8 +17,6 @@ from .components import (
 )
 from .api_client import format_error_detail
 
-ALL_NEWS_CATEGORIES = ["business", "entertainment", "general", "health", "science", "sports", "technology"]
-
 
 def register_callbacks(app, api_client):
 
@@ -201,57 +199,46 @@ def register_callbacks(app, api_client):
             categories = categories or []
             keywords = keywords or ""
 
-            # persist selected categories in user preferences
-            try:
-                pref_resp = api_client.get_preferences()
-                if pref_resp.status_code == 200:
-                    prefs = pref_resp.json()
-                else:
-                    prefs = {}
-
-                api_client.update_preferences(
-                    categories,
-                    keywords,
-                    locations or prefs.get('locations', []),
-                    share_read_time=prefs.get('share_read_time', False),
-                    experimental_opt_in=prefs.get('experimental_opt_in', False)
-                )
-            except Exception as pref_err:
-                print(f"Error updating preferences from filters: {pref_err}")
-
-            fetch_categories = categories or ALL_NEWS_CATEGORIES
-            pers_resp = api_client.get_personalized_news()
-            pers_articles = []
-            if pers_resp.status_code == 200:
-                pers_data = pers_resp.json()
-                pers_articles = pers_data.get('articles', [])
-
-            gen_categories = fetch_categories
-            gen_resp = api_client.fetch_news(gen_categories, keywords, locations or [])
-            gen_articles = []
-            if gen_resp.status_code == 200:
-                gen_data = gen_resp.json()
-                gen_articles = gen_data.get('articles', [])
-
-            pers_ids = {a.get('article_id') for a in pers_articles}
-            gen_articles = [a for a in gen_articles if a.get('article_id') not in pers_ids]
-
-            liked_ids = []
-            liked_resp = api_client.get_liked_articles()
-            if liked_resp.status_code == 200:
-                liked_data = liked_resp.json()
-                liked_ids = [a['article_id'] for a in liked_data.get('liked_articles', [])]
+            # the backend persists the filters as preferences, builds both
+            # sections, de-duplicates them and marks liked articles
+            feed_resp = api_client.get_feed(categories, keywords, locations or [])
+            pers_articles, gen_articles = [], []
+            if feed_resp.status_code == 200:
+                feed_data = feed_resp.json()
+                pers_articles = feed_data.get('personalized', [])
+                gen_articles = feed_data.get('general', [])
+            else:
+                print(f"Feed API error: {feed_resp.status_code} - {feed_resp.text}")
 
             def _cards(articles):
                 if not articles:
                     return [html.Div("No articles found.", className="text-center text-muted")]
-                return [create_news_card(a, liked=a['article_id'] in liked_ids) for a in articles]
+                return [create_news_card(a, liked=a.get('liked', False)) for a in articles]
 
             return _cards(pers_articles), _cards(gen_articles)
         except Exception as e:
             print(f"Exception in update_news_feed: {str(e)}")
             return [html.Div(f"Connection error: {str(e)}", className="text-center text-danger")]
 
+    @app.callback(
+        Output('keyword-suggestions', 'children'),
+        [Input('search-keywords', 'value')],
+        prevent_initial_call=True
+    )
+    def update_keyword_suggestions(value):
+        # only complete the word currently being typed
+        prefix = (value or "").split(" ")[-1]
+        if len(prefix) < 2:
+            return []
+        try:
+            response = api_client.suggest_keywords(prefix)
+            if response.status_code == 200:
+                head = value[:len(value) - len(prefix)]
+                return [html.Option(value=head + term) for term in response.json().get('suggestions', [])]
+        except Exception as e:
+            print(f"Error loading keyword suggestions: {e}")
+        return []
+
     @app.callback(
         Output('user-welcome', 'children'),
         [Input('url', 'pathname')],
@@ -293,38 +280,51 @@ def register_callbacks(app, api_client):
         return ""
 
     @app.callback(
-        Output('saved-articles-list', 'children'),
+        [Output('saved-articles-list', 'children'),
+         Output('saved-articles-cursor', 'data'),
+         Output('load-more-saved', 'style')],
         [Input('refresh-saved', 'n_clicks'),
+         Input('load-more-saved', 'n_clicks'),
          Input('url', 'pathname')],
-        [State('auth-store', 'data')],
+        [State('auth-store', 'data'),
+         State('saved-articles-cursor', 'data'),
+         State('saved-articles-list', 'children')],
         prevent_initial_call=False
     )
-    def load_saved_articles(n_clicks, pathname, auth_data):
+    def load_saved_articles(n_clicks, more_clicks, pathname, auth_data, cursor, shown):
+        hidden = {'display': 'none'}
         if pathname == '/news-feed' and auth_data and auth_data.get('token'):
+            # "Load More" appends the next page; anything else starts from the newest
+            triggered = callback_context.triggered[0]['prop_id'] if callback_context.triggered else ''
+            load_more = bool(cursor) and triggered == 'load-more-saved.n_clicks'
             try:
                 api_client.set_token(auth_data['token'])
-                response = api_client.get_saved_articles()
+                response = api_client.get_saved_articles(cursor=cursor if load_more else None)
                 if response.status_code == 200:
                     data = response.json()
                     articles = data.get('saved_articles', [])
-                    if articles:
-                        return [
-                            html.Div([
-                                html.A(article['title'], href=article['url'], target="_blank",
-                                       className="text-decoration-none"),
-                                html.Br(),
-                                html.Small(article['source'], className="text-muted")
-                            ], className="mb-2") for article in articles
-                        ]
-                    else:
-                        return [html.P("No saved articles.", className="text-muted")]
+                    next_cursor = data.get('next_cursor')
+                    more_style = {'display': 'block'} if next_cursor else hidden
+                    items = [
+                        html.Div([
+                            html.A(article['title'], href=article['url'], target="_blank",
+                                   className="text-decoration-none"),
+                            html.Br(),
+                            html.Small(article['source'], className="text-muted")
+                        ], className="mb-2") for article in articles
+                    ]
+                    if load_more:
+                        return (shown or []) + items, next_cursor, more_style
+                    if items:
+                        return items, next_cursor, more_style
+                    return [html.P("No saved articles.", className="text-muted")], None, hidden
                 else:
                     print(f"Saved articles API error: {response.status_code} - {response.text}")
-                    return [html.P("Error loading saved articles.", className="text-danger")]
+                    return [html.P("Error loading saved articles.", className="text-danger")], None, hidden
             except Exception as e:
                 print(f"Exception in load_saved_articles: {str(e)}")
-                return [html.P(f"Error loading saved articles: {str(e)}", className="text-danger")]
-        return []
+                return [html.P(f"Error loading saved articles: {str(e)}", className="text-danger")], None, hidden
+        return [], None, hidden
 
     @app.callback(
         Output({'type': 'save-article-btn', 'index': dash.dependencies.MATCH}, 'children'),
@@ -102,7 +102,9 @@ def create_news_feed_layout():
                         ),
                         html.Hr(),
                         html.H6("Search"),
-                        dbc.Input(id="search-keywords", placeholder="Search keywords", type="text", className="mb-3"),
+                        dbc.Input(id="search-keywords", placeholder="Search keywords", type="text",
+                                  list="keyword-suggestions", className="mb-3"),
+                        html.Datalist(id="keyword-suggestions"),
                         html.H6("Preferred Locations"),
                         dbc.Checklist(
                             id="location-preferences",
@@ -136,6 +138,9 @@ def create_news_feed_layout():
                     html.Div("Saved Articles", className="card-header"),
                     dbc.CardBody([
                         html.Div(id="saved-articles-list"),
+                        dcc.Store(id="saved-articles-cursor"),
+                        dbc.Button("Load More", id="load-more-saved", color="link", className="w-100",
+                                   style={"display": "none"}),
                         dbc.Button("Refresh Saved Articles", id="refresh-saved", color="info", className="w-100 mt-3")
                     ])
                 ], className="shadow-sm")
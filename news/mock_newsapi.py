@@ -0,0 +1,348 @@
+"""Local stand-in for the News API, for offline development and load tests.
+
+Serves ``/v2/top-headlines``, ``/v2/everything`` and ``/v2/sources`` from the
+cached responses in ``assets/cache/news_<category>_<country>.json`` and can
+inject latency, server errors and 429 rate limiting. Point the backend at it
+with ``NEWS_API_BASE_URL=http://127.0.0.1:8099/v2``.
+
+Usage:
+    python news/mock_newsapi.py --port 8099 --latency-ms 150 --error-rate 0.02
+
+Fault settings can be changed while running:
+    curl -X POST localhost:8099/__config -d '{"rate_limit_rate": 0.5}'
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import threading
+import time
+from copy import deepcopy
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets', 'cache')
+FIXTURE_RE = re.compile(r'news_([a-z]+)_([a-z]{2})\.json$')
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class FaultConfig:
+    """Latency and failure knobs, adjustable at runtime through ``/__config``."""
+
+    FIELDS = {
+        'latency_ms': float,
+        'jitter_ms': float,
+        'error_rate': float,
+        'rate_limit_rate': float,
+        'requests_per_minute': int,
+        'retry_after': int,
+    }
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, rate_limit_rate=0.0,
+                 requests_per_minute=0, retry_after=1):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        # hard cap across all clients; 0 disables it
+        self.requests_per_minute = requests_per_minute
+        self.retry_after = retry_after
+
+    def update(self, values):
+        for key, value in values.items():
+            if key not in self.FIELDS:
+                raise ValueError(f"Unknown setting '{key}'")
+            setattr(self, key, self.FIELDS[key](value))
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+
+class MockNewsAPI:
+    """Fixture corpus plus request accounting shared by all handler threads."""
+
+    def __init__(self, fixture_dir=DEFAULT_FIXTURE_DIR, variants=1, faults=None, verbose=False):
+        self.faults = faults or FaultConfig()
+        self.verbose = verbose
+        self.articles = load_fixtures(fixture_dir, variants)
+        # per-category copies served for categories without a fixture
+        self._retagged = {}
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.counters = {'requests': 0, 'ok': 0, 'errors': 0, 'rate_limited': 0}
+
+    def count(self, key):
+        with self._lock:
+            self.counters[key] += 1
+
+    def over_limit(self):
+        """Count one request against the per-minute cap; True if it exceeds it."""
+        limit = self.faults.requests_per_minute
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= 60:
+                self._window_start, self._window_count = now, 0
+            self._window_count += 1
+            return bool(limit) and self._window_count > limit
+
+    def top_headlines(self, params):
+        category = params.get('category')
+        country = params.get('country')
+        sources = params.get('sources')
+        if sources and (category or country):
+            return 400, error_body('parametersIncompatible',
+                                   "You can't mix the sources parameter with the country or category parameters.")
+        matches = self.articles
+        if sources:
+            wanted = set(sources.split(','))
+            matches = [a for a in matches if a['source'].get('id') in wanted]
+        else:
+            if category:
+                matches = [a for a in matches if a['_category'] == category]
+            if country:
+                matches = [a for a in matches if a['_country'] == country]
+            if category and not matches:
+                # no fixture for this category: serve the corpus re-tagged, as the real
+                # endpoint never comes back empty for a valid category
+                matches = [a for a in self.retagged(category) if not country or a['_country'] == country]
+        matches = filter_query(matches, params.get('q'))
+        return 200, page_body(matches, params)
+
+    def retagged(self, category):
+        """Copies of the corpus as ``category`` stories, with their own URLs and titles.
+
+        Distinct URLs keep each category a separate set of stories for
+        clients that deduplicate on URL, like the backend's local corpus.
+        """
+        copies = self._retagged.get(category)
+        if copies is None:
+            copies = []
+            for article in self.articles:
+                copy = deepcopy(article)
+                copy['url'] = f"{article['url']}#{category}"
+                copy['title'] = f"{article.get('title') or ''} [{category}]"
+                copy['_category'] = category
+                copies.append(copy)
+            self._retagged[category] = copies
+        return copies
+
+    def everything(self, params):
+        query = params.get('q')
+        if not query and not params.get('sources') and not params.get('domains'):
+            return 400, error_body('parametersMissing',
+                                   'Required parameters are missing, the scope of your search is too broad.')
+        matches = filter_query(self.articles, query)
+        if params.get('sources'):
+            wanted = set(params['sources'].split(','))
+            matches = [a for a in matches if a['source'].get('id') in wanted]
+        if params.get('from'):
+            matches = [a for a in matches if a['publishedAt'] >= params['from']]
+        if params.get('to'):
+            matches = [a for a in matches if a['publishedAt'][:len(params['to'])] <= params['to']]
+        if params.get('sortBy', 'publishedAt') == 'publishedAt':
+            matches = sorted(matches, key=lambda a: a['publishedAt'], reverse=True)
+        return 200, page_body(matches, params)
+
+    def sources(self, params):
+        found = {}
+        for article in self.articles:
+            source = article['source']
+            source_id = source.get('id') or re.sub(r'[^a-z0-9]+', '-', (source.get('name') or '').lower()).strip('-')
+            if not source_id or source_id in found:
+                continue
+            if params.get('category') and article['_category'] != params['category']:
+                continue
+            if params.get('country') and article['_country'] != params['country']:
+                continue
+            found[source_id] = {
+                'id': source_id,
+                'name': source.get('name'),
+                'description': f"Articles from {source.get('name')}",
+                'url': '{0.scheme}://{0.netloc}'.format(urlparse(article['url'])),
+                'category': article['_category'],
+                'language': 'en',
+                'country': article['_country'],
+            }
+        return 200, {'status': 'ok', 'sources': list(found.values())}
+
+
+def load_fixtures(fixture_dir, variants=1):
+    """Load every cached response in ``fixture_dir``.
+
+    ``variants`` > 1 adds copies of each article with distinct URLs, titles
+    and earlier publish times, to give load tests a larger corpus.
+    """
+    articles = []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, 'news_*_*.json'))):
+        match = FIXTURE_RE.search(os.path.basename(path))
+        if not match:
+            continue
+        category, country = match.groups()
+        with open(path) as f:
+            data = json.load(f)
+        for raw in data.get('articles', []) if isinstance(data, dict) else data:
+            if not isinstance(raw, dict):
+                continue
+            raw = {k: v for k, v in raw.items() if k != 'fetched_at'}
+            raw.setdefault('source', {'id': None, 'name': 'Unknown'})
+            raw.setdefault('publishedAt', datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'))
+            raw.setdefault('url', '')
+            for n in range(max(1, variants)):
+                article = deepcopy(raw) if n else raw
+                if n:
+                    article['url'] = f"{raw['url']}#v{n}"
+                    article['title'] = f"{raw.get('title') or ''} ({n})"
+                    article['publishedAt'] = shift_timestamp(raw['publishedAt'], minutes=-n)
+                article['_category'] = category
+                article['_country'] = country
+                articles.append(article)
+    return articles
+
+
+def shift_timestamp(value, minutes):
+    try:
+        parsed = datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ')
+    except ValueError:
+        return value
+    return (parsed + timedelta(minutes=minutes)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def filter_query(articles, query):
+    """Match NewsAPI-style ``q``: any ``OR`` alternative as a case-insensitive substring."""
+    if not query:
+        return articles
+    terms = [t.strip().strip('"').lower() for t in re.split(r'\s+OR\s+', query) if t.strip()]
+    return [
+        a for a in articles
+        if any(t in f"{a.get('title') or ''} {a.get('description') or ''}".lower() for t in terms)
+    ]
+
+
+def page_body(articles, params):
+    try:
+        page_size = min(MAX_PAGE_SIZE, max(1, int(params.get('pageSize', DEFAULT_PAGE_SIZE))))
+        page = max(1, int(params.get('page', 1)))
+    except ValueError:
+        page_size, page = DEFAULT_PAGE_SIZE, 1
+    start = (page - 1) * page_size
+    served = [{k: v for k, v in a.items() if not k.startswith('_')} for a in articles[start:start + page_size]]
+    return {'status': 'ok', 'totalResults': len(articles), 'articles': served}
+
+
+def error_body(code, message):
+    return {'status': 'error', 'code': code, 'message': message}
+
+
+def make_handler(api):
+    routes = {
+        '/v2/top-headlines': api.top_headlines,
+        '/v2/everything': api.everything,
+        '/v2/sources': api.sources,
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == '/__config':
+                return self.send_json(200, api.faults.as_dict())
+            if url.path == '/__stats':
+                return self.send_json(200, dict(api.counters, articles=len(api.articles)))
+            route = routes.get(url.path)
+            if route is None:
+                return self.send_json(404, error_body('notFound', f'Unknown endpoint {url.path}'))
+
+            api.count('requests')
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            faults = api.faults
+            delay = faults.latency_ms + random.uniform(0, faults.jitter_ms)
+            if delay > 0:
+                time.sleep(delay / 1000)
+
+            if not params.get('apiKey') and not self.headers.get('X-Api-Key'):
+                api.count('errors')
+                return self.send_json(401, error_body('apiKeyMissing', 'Your API key is missing.'))
+            if api.over_limit() or random.random() < faults.rate_limit_rate:
+                api.count('rate_limited')
+                return self.send_json(
+                    429,
+                    error_body('rateLimited', 'You have made too many requests recently.'),
+                    {'Retry-After': str(faults.retry_after)},
+                )
+            if random.random() < faults.error_rate:
+                api.count('errors')
+                return self.send_json(500, error_body('unexpectedError', 'Injected server error.'))
+
+            status, body = route(params)
+            api.count('ok' if status == 200 else 'errors')
+            self.send_json(status, body)
+
+        def do_POST(self):
+            if urlparse(self.path).path != '/__config':
+                return self.send_json(404, error_body('notFound', 'Unknown endpoint'))
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                api.faults.update(json.loads(self.rfile.read(length) or b'{}'))
+            except (ValueError, TypeError) as e:
+                return self.send_json(400, error_body('badConfig', str(e)))
+            self.send_json(200, api.faults.as_dict())
+
+        def send_json(self, status, body, headers=None):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            if api.verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def serve(host='127.0.0.1', port=8099, fixture_dir=DEFAULT_FIXTURE_DIR, variants=1, faults=None, verbose=False):
+    """Build the server; call ``serve_forever`` on it (or run it in a thread in tests)."""
+    api = MockNewsAPI(fixture_dir, variants, faults, verbose)
+    server = ThreadingHTTPServer((host, port), make_handler(api))
+    server.daemon_threads = True
+    server.api = api
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURE_DIR, help='directory of news_<category>_<country>.json files')
+    parser.add_argument('--variants', type=int, default=1, help='copies of each fixture article to serve')
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='fraction of requests answered with 429')
+    parser.add_argument('--requests-per-minute', type=int, default=0, help='answer 429 above this rate (0 = unlimited)')
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    faults = FaultConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate,
+                         args.requests_per_minute, args.retry_after)
+    server = serve(args.host, args.port, args.fixtures, args.variants, faults, args.verbose)
+    print(f"Mock News API serving {len(server.api.articles)} articles on http://{args.host}:{args.port}/v2")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
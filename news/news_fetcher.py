@@ -6,7 +6,8 @@ import json
 # News API configuration
 # Get your API key from https://newsapi.org/
 NEWS_API_KEY = os.environ.get('NEWS_API_KEY', '758c48dbb96c4f96b40fd091e07070ac')
-NEWS_API_BASE_URL = 'https://newsapi.org/v2'
+# Override to point at a local stand-in, e.g. news/mock_newsapi.py
+NEWS_API_BASE_URL = os.environ.get('NEWS_API_BASE_URL', 'https://newsapi.org/v2').rstrip('/')
 
 
 # Uncomment this line to always use sample data (for testing)
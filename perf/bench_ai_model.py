@@ -0,0 +1,225 @@
+"""Micro-benchmarks for the NLP and ranking functions in backend/ai_model.py.
+
+Each function runs over synthetic corpora (10 to 100k articles) and interest
+profiles (empty to heavy). Timing runs and a separate tracemalloc run record
+the median/min seconds and peak allocated memory.
+
+    python perf/bench_ai_model.py --save-baseline perf/ai_model_baseline.json
+    python perf/bench_ai_model.py --baseline perf/ai_model_baseline.json
+
+When comparing, any case slower or hungrier than the baseline by more than
+the tolerances is reported and the script exits non-zero. Baselines are
+machine-specific, so record them on the machine that runs the comparison.
+Sizes whose estimated run time exceeds ``--budget`` seconds are skipped.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from copy import deepcopy
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from ai_model import (  # noqa: E402
+    AVAILABLE_LOCATIONS,
+    analyze_activity,
+    build_user_profile,
+    extract_keywords,
+    increment_interest_profile,
+    rank_categories_by_tfidf,
+    recommend_articles,
+)
+
+CATEGORIES = ['business', 'entertainment', 'general', 'health', 'science', 'sports', 'technology']
+SOURCES = [f'Source {i}' for i in range(60)]
+VOCABULARY = (
+    'election government minister vote court law policy campaign senate congress president parliament '
+    'market stock economy inflation bank trade company profit earnings investor startup funding merger '
+    'technology software chip phone launch device network security data cloud robot model research '
+    'health hospital vaccine virus doctor patient drug trial disease study cancer treatment nutrition '
+    'science space rocket planet climate energy ocean storm weather fossil discovery telescope species '
+    'sports match team player season coach league final score championship transfer injury record '
+    'film music album concert actor star festival series award tour show release premiere '
+    'city police fire crash protest strike report investigation official warning deal plan talks'
+).split() + [loc.lower() for loc in AVAILABLE_LOCATIONS]
+SIZES = [10, 100, 1000, 10000, 100000]
+PROFILES = {'empty': 0, 'light': 20, 'medium': 500, 'heavy': 20000}
+
+
+def make_articles(n, seed=7):
+    rng = random.Random(seed)
+    articles = []
+    for i in range(n):
+        articles.append({
+            'article_id': f'bench-{i}',
+            'title': ' '.join(rng.choices(VOCABULARY, k=rng.randint(6, 12))).capitalize(),
+            'description': ' '.join(rng.choices(VOCABULARY, k=rng.randint(15, 30))).capitalize() + '.',
+            'source': rng.choice(SOURCES),
+            'category': rng.choice(CATEGORIES),
+            'interaction': rng.choice([1, 1, 1, 3]),
+        })
+    return articles
+
+
+def make_profile(keywords, seed=11):
+    """An interest profile with ``keywords`` distinct keyword entries."""
+    rng = random.Random(seed)
+    words = list(VOCABULARY) + [f'term{i}' for i in range(max(0, keywords - len(VOCABULARY)))]
+    return {
+        'keywords': Counter({w: rng.randint(1, 50) for w in words[:keywords]}),
+        'sources': Counter({s: rng.randint(1, 20) for s in SOURCES[:min(len(SOURCES), keywords // 10)]}),
+        'categories': Counter({c: rng.randint(1, 30) for c in CATEGORIES[:min(len(CATEGORIES), keywords)]}),
+        'locations': Counter({loc: rng.randint(1, 5) for loc in AVAILABLE_LOCATIONS[:min(6, keywords // 50)]}),
+    }
+
+
+def cases(sizes, corpus):
+    """Yield ``(name, size, profile, setup)``; ``setup()`` returns a zero-argument callable to measure."""
+    preferences = {'keywords': 'election climate startup', 'categories': ['technology'], 'locations': ['UK']}
+    for n in sizes:
+        articles = corpus[:n]
+        texts = [f"{a['title']} {a['description']}" for a in articles]
+        yield 'extract_keywords', n, None, lambda texts=texts: (lambda: [extract_keywords(t) for t in texts])
+        yield 'build_user_profile', n, None, lambda a=articles: (lambda: build_user_profile(a))
+        yield 'analyze_activity', n, 'list', lambda a=articles: (lambda: analyze_activity(a, preferences))
+
+        category_docs = {c: ' '.join(t for t, a in zip(texts, articles) if a['category'] == c) for c in CATEGORIES}
+        for profile_name, size in PROFILES.items():
+            profile = make_profile(size)
+
+            def recommend(a=articles, p=profile):
+                copies = [dict(x) for x in a]  # recommend_articles writes score/explanation
+                return lambda: recommend_articles(p, copies)
+            yield 'recommend_articles', n, profile_name, recommend
+
+            def increment(a=articles, p=profile):
+                target = deepcopy(p)
+                return lambda: [increment_interest_profile(target, x) for x in a]
+            yield 'increment_interest_profile', n, profile_name, increment
+
+            keywords = list(profile['keywords'])
+            yield ('rank_categories_by_tfidf', n, profile_name,
+                   lambda k=keywords, d=category_docs: (lambda: rank_categories_by_tfidf(k, d)))
+
+    for profile_name, size in PROFILES.items():
+        profile = make_profile(size)
+        yield 'analyze_activity', 0, profile_name, lambda p=profile: (lambda: analyze_activity(p, preferences))
+
+
+def measure(setup, repeat):
+    timings = []
+    for _ in range(repeat):
+        fn = setup()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    # tracing slows execution down, so peak memory gets its own run
+    fn = setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'median_s': round(statistics.median(timings), 6),
+        'min_s': round(min(timings), 6),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def case_key(name, size, profile):
+    parts = [f'articles={size}'] if size else []
+    if profile:
+        parts.append(f'profile={profile}')
+    return f"{name}[{','.join(parts)}]"
+
+
+def run(sizes, repeat, budget, only=None):
+    corpus = make_articles(max(sizes))
+    results = {}
+    # last measured (size, seconds) per function/profile, to extrapolate the next size
+    last = {}
+    for name, size, profile, setup in cases(sizes, corpus):
+        if only and name not in only:
+            continue
+        key = case_key(name, size, profile)
+        previous = last.get((name, profile))
+        if previous and size:
+            estimate = previous[1] * size / previous[0] * (repeat + 1)
+            if estimate > budget:
+                results[key] = {'skipped': f'estimated {estimate:.0f}s exceeds budget'}
+                print(f'{key:<60} skipped (~{estimate:.0f}s)')
+                continue
+        stats = measure(setup, repeat)
+        if size:
+            last[(name, profile)] = (size, stats['median_s'])
+        results[key] = stats
+        print(f"{key:<60} median={stats['median_s']:.4f}s min={stats['min_s']:.4f}s peak={stats['peak_kib']}KiB")
+    return results
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance):
+    regressions = []
+    for key, stats in results.items():
+        before = baseline.get(key)
+        if not before or 'skipped' in stats or 'skipped' in before:
+            continue
+        # ignore timer noise on sub-millisecond cases
+        if stats['median_s'] > 0.001 and stats['median_s'] > before['median_s'] * (1 + time_tolerance):
+            regressions.append(f"{key}: {before['median_s']}s -> {stats['median_s']}s")
+        if stats['peak_kib'] > 64 and stats['peak_kib'] > before['peak_kib'] * (1 + memory_tolerance):
+            regressions.append(f"{key}: peak {before['peak_kib']}KiB -> {stats['peak_kib']}KiB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the ai_model functions.')
+    parser.add_argument('--sizes', default=','.join(map(str, SIZES)), help='comma-separated corpus sizes')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--budget', type=float, default=120, help='skip cases estimated to take longer (seconds)')
+    parser.add_argument('--only', help='comma-separated function names to run')
+    parser.add_argument('--output', help='write the full report as JSON')
+    parser.add_argument('--save-baseline', help='write results as the new baseline file')
+    parser.add_argument('--baseline', help='baseline file to compare against')
+    parser.add_argument('--time-tolerance', type=float, default=0.25)
+    parser.add_argument('--memory-tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    sizes = sorted(int(s) for s in args.sizes.split(','))
+    only = set(args.only.split(',')) if args.only else None
+    results = run(sizes, args.repeat, args.budget, only)
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': args.repeat,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'Baseline written to {args.save_baseline}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline.get('results', {}), args.time_tolerance, args.memory_tolerance)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        if regressions:
+            sys.exit(1)
+        print('No regressions against baseline')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,271 @@
+"""Load generator for the backend API.
+
+Registers synthetic users, logs them in, then has each one drive a weighted
+mix of feed, fetch, interaction and preferences calls until the run ends.
+Per-endpoint throughput and latency percentiles go to a JSON report.
+
+Typical offline setup (three shells):
+    python news/mock_newsapi.py --port 8099 --variants 20 --latency-ms 100
+    cd backend && NEWS_API_BASE_URL=http://127.0.0.1:8099/v2 WEB_CONCURRENCY=2 uvicorn main:app
+    python perf/loadtest.py --users 50 --duration 120 --output perf/report.json
+
+Pass ``--baseline`` with an earlier report to exit non-zero when any
+endpoint's p95 regressed by more than ``--max-regression``.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+import requests
+
+CATEGORIES = ['business', 'entertainment', 'general', 'health', 'science', 'sports', 'technology']
+KEYWORDS = ['election', 'climate', 'market', 'ai', 'football', 'vaccine', 'space', 'music', 'energy', 'startup']
+LOCATIONS = ['USA', 'UK', 'India', 'Germany', 'Japan']
+ACTIONS = ('personalized', 'fetch', 'read', 'like', 'save', 'saved', 'get_preferences', 'put_preferences',
+           'feed', 'search')
+DEFAULT_MIX = 'personalized=30,fetch=25,read=15,like=8,save=7,saved=5,get_preferences=5,put_preferences=5'
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    """Thread-safe latency samples and status counts per endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.errors = defaultdict(int)
+
+    def record(self, endpoint, started, status):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.latencies[endpoint].append(elapsed_ms)
+            self.statuses[endpoint][str(status)] += 1
+            if status == 'error' or int(status) >= 400:
+                self.errors[endpoint] += 1
+
+    def summary(self, duration):
+        endpoints = {}
+        with self._lock:
+            for endpoint, samples in sorted(self.latencies.items()):
+                ordered = sorted(samples)
+                endpoints[endpoint] = {
+                    'count': len(ordered),
+                    'errors': self.errors[endpoint],
+                    'status_codes': dict(self.statuses[endpoint]),
+                    'throughput_rps': round(len(ordered) / duration, 2) if duration else None,
+                    'mean_ms': round(sum(ordered) / len(ordered), 2),
+                    'p50_ms': round(percentile(ordered, 50), 2),
+                    'p95_ms': round(percentile(ordered, 95), 2),
+                    'p99_ms': round(percentile(ordered, 99), 2),
+                    'max_ms': round(ordered[-1], 2),
+                }
+        total = sum(e['count'] for e in endpoints.values())
+        return {
+            'requests': total,
+            'errors': sum(e['errors'] for e in endpoints.values()),
+            'throughput_rps': round(total / duration, 2) if duration else None,
+            'endpoints': endpoints,
+        }
+
+
+class VirtualUser:
+    def __init__(self, base_url, run_id, index, recorder, think_ms, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.recorder = recorder
+        self.think_ms = think_ms
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.username = f'load_{run_id}_{index}'
+        self.password = uuid.uuid4().hex
+        self.categories = random.sample(CATEGORIES, random.randint(1, 3))
+        self.article_ids = []
+
+    def call(self, endpoint, method, path, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, f'{self.base_url}{path}', timeout=self.timeout, **kwargs)
+        except requests.RequestException:
+            self.recorder.record(endpoint, started, 'error')
+            return None
+        self.recorder.record(endpoint, started, response.status_code)
+        return response
+
+    def setup(self):
+        self.call('register', 'POST', '/api/auth/register', json={
+            'username': self.username,
+            'email': f'{self.username}@example.com',
+            'password': self.password,
+            'categories': self.categories,
+        })
+        response = self.call('login', 'POST', '/api/auth/login',
+                             json={'username': self.username, 'password': self.password})
+        if response is None or response.status_code != 200:
+            return False
+        self.session.headers['Authorization'] = f"Bearer {response.json()['access_token']}"
+        return True
+
+    def remember(self, response, key='articles'):
+        if response is not None and response.status_code == 200:
+            ids = [a.get('article_id') for a in response.json().get(key, []) if a.get('article_id')]
+            if ids:
+                self.article_ids = ids[:50]
+
+    def run_action(self, action):
+        if action == 'personalized':
+            self.remember(self.call(action, 'GET', '/api/news/personalized'))
+        elif action == 'fetch':
+            self.remember(self.call(action, 'POST', '/api/news/fetch', json={
+                'categories': random.sample(CATEGORIES, random.randint(1, 3)),
+                'keywords': random.choice(KEYWORDS) if random.random() < 0.5 else '',
+                'locations': [],
+                'limit': 20,
+            }))
+        elif action in ('read', 'like', 'save'):
+            if not self.article_ids:
+                return self.run_action('fetch')
+            article_id = random.choice(self.article_ids)
+            path = {'read': 'read-article', 'like': 'like-article', 'save': 'save-article'}[action]
+            self.call(action, 'POST', f'/api/user/{path}/{article_id}')
+        elif action == 'saved':
+            self.call(action, 'GET', '/api/user/saved-articles', params={'page_size': 20})
+        elif action == 'get_preferences':
+            self.call(action, 'GET', '/api/user/preferences')
+        elif action == 'put_preferences':
+            self.call(action, 'PUT', '/api/user/preferences', json={
+                'categories': random.sample(CATEGORIES, random.randint(1, 3)),
+                'keywords': ' '.join(random.sample(KEYWORDS, 2)),
+                'locations': random.sample(LOCATIONS, 1),
+            })
+        elif action == 'feed':
+            self.call(action, 'POST', '/api/feed', json={'categories': self.categories, 'keywords': '', 'limit': 20})
+        elif action == 'search':
+            self.call(action, 'GET', '/api/news/search', params={'q': random.choice(KEYWORDS)})
+
+    def loop(self, mix, deadline):
+        actions, weights = zip(*mix.items())
+        while time.monotonic() < deadline:
+            self.run_action(random.choices(actions, weights)[0])
+            if self.think_ms:
+                time.sleep(random.uniform(0, 2 * self.think_ms) / 1000)
+
+
+def parse_mix(spec):
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ACTIONS:
+            raise argparse.ArgumentTypeError(f"unknown action '{name}', expected one of {', '.join(ACTIONS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def compare(report, baseline, max_regression):
+    """Return human-readable p95 regressions relative to ``baseline``."""
+    regressions = []
+    for endpoint, stats in report['results']['endpoints'].items():
+        before = baseline.get('results', {}).get('endpoints', {}).get(endpoint)
+        if not before or not before.get('p95_ms'):
+            continue
+        change = stats['p95_ms'] / before['p95_ms'] - 1
+        if change > max_regression:
+            regressions.append(f"{endpoint}: p95 {before['p95_ms']}ms -> {stats['p95_ms']}ms (+{change:.0%})")
+    return regressions
+
+
+def run(args):
+    mix = args.mix
+    run_id = uuid.uuid4().hex[:8]
+    recorder = Recorder()
+    users = [VirtualUser(args.base_url, run_id, i, recorder, args.think_ms, args.timeout) for i in range(args.users)]
+
+    setup_threads = [threading.Thread(target=u.setup) for u in users]
+    for t in setup_threads:
+        t.start()
+    for t in setup_threads:
+        t.join()
+    setup = recorder.summary(0)['endpoints']
+    ready = [u for u in users if 'Authorization' in u.session.headers]
+    if not ready:
+        sys.exit('No synthetic user could log in; is the backend running?')
+
+    # only the steady-state mix counts towards throughput
+    recorder = Recorder()
+    for u in ready:
+        u.recorder = recorder
+    started = time.monotonic()
+    deadline = started + args.duration
+    threads = [threading.Thread(target=u.loop, args=(mix, deadline)) for u in ready]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    duration = time.monotonic() - started
+
+    return {
+        'run_id': run_id,
+        'started_at': datetime.now().isoformat(),
+        'config': {
+            'base_url': args.base_url,
+            'users': args.users,
+            'logged_in': len(ready),
+            'duration_seconds': args.duration,
+            'think_ms': args.think_ms,
+            'mix': mix,
+        },
+        'setup': setup,
+        'results': recorder.summary(duration),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Drive a realistic request mix against the backend API.')
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--users', type=int, default=20, help='concurrent synthetic users')
+    parser.add_argument('--duration', type=float, default=60, help='steady-state seconds')
+    parser.add_argument('--think-ms', type=float, default=0, help='mean pause between a user\'s requests')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--mix', default=DEFAULT_MIX, type=parse_mix,
+                        help=f"weighted actions from: {', '.join(ACTIONS)}")
+    parser.add_argument('--output', default='loadtest-report.json')
+    parser.add_argument('--baseline', help='earlier report to compare p95 latencies against')
+    parser.add_argument('--max-regression', type=float, default=0.2, help='allowed p95 increase, e.g. 0.2 = 20%%')
+    args = parser.parse_args()
+
+    report = run(args)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    results = report['results']
+    print(f"{results['requests']} requests, {results['errors']} errors, {results['throughput_rps']} req/s")
+    for endpoint, stats in results['endpoints'].items():
+        print(f"  {endpoint:<16} n={stats['count']:<6} p50={stats['p50_ms']:>8}ms "
+              f"p95={stats['p95_ms']:>8}ms p99={stats['p99_ms']:>8}ms errors={stats['errors']}")
+    print(f'Report written to {args.output}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.max_regression)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()